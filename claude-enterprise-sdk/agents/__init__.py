@@ -1,6 +1,6 @@
 """Agent implementations"""
 
-from .base import BaseAgent, AgentResult
+from .base import BaseAgent, AgentResult, AgentStream
 from .dev_agent import DevAgent
 from .test_agent import TestAgent
 from .cyber_agent import CyberAgent
@@ -9,6 +9,7 @@ from .cicd_agent import CICDAgent, Environment
 __all__ = [
     "BaseAgent",
     "AgentResult",
+    "AgentStream",
     "DevAgent",
     "TestAgent",
     "CyberAgent",
@@ -1,16 +1,104 @@
 """Base agent wrapper for Claude Agent SDK."""
 from __future__ import annotations
 
+import asyncio
+import copy
+import io
+import itertools
+import os
+import sys
+import threading
 import uuid
-from dataclasses import dataclass, field
-from typing import Optional, AsyncIterator
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 from pathlib import Path
 
 from shared_context.store import ContextStore, TaskContext
-from .utilities.audit import log_agent_start, log_agent_complete
+from .utilities.audit import AuditContext, audit_timestamp, log_agent_complete, log_agent_start
 
+try:
+    from claude_code_sdk import query, ClaudeCodeOptions
+    _SDK_AVAILABLE = True
+except ImportError:  # Optional dependency - run() reports how to install it
+    _SDK_AVAILABLE = False
 
-@dataclass
+try:
+    from claude_code_sdk import TextBlock
+except ImportError:  # Text blocks are then resolved by _resolve_block_text
+    TextBlock = None
+
+try:
+    from claude_code_sdk import ClaudeSDKClient
+except ImportError:  # Older SDKs only provide query()
+    ClaudeSDKClient = None
+
+# Older SDKs have no include_partial_messages option; run_stream() then
+# yields complete text blocks only
+_PARTIAL_MESSAGES = _SDK_AVAILABLE and any(
+    f.name == "include_partial_messages" for f in fields(ClaudeCodeOptions)
+)
+
+
+# Generated task IDs are a per-process random tag plus a counter, rather
+# than a fresh uuid4 per task. The tag keeps IDs from colliding with those
+# of earlier runs in the same store (a bare PID could be reused).
+_TASK_ID_TAG = uuid.uuid4().hex[:8]
+_TASK_COUNTER = itertools.count()
+
+
+def _reset_task_ids() -> None:
+    """Give a forked child its own task ID tag and counter."""
+    global _TASK_ID_TAG, _TASK_COUNTER
+    _TASK_ID_TAG = uuid.uuid4().hex[:8]
+    _TASK_COUNTER = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_task_ids)
+
+
+# Task descriptions are truncated to this many characters in saved contexts.
+# A slice that covers the whole string returns the string itself, so short
+# descriptions are not copied.
+_DESCRIPTION_LIMIT = 500
+
+
+def _append_text(buf: io.StringIO, text: str) -> None:
+    """Append a non-empty text chunk, newline-separated from earlier chunks."""
+    if text:
+        if buf.tell():
+            buf.write("\n")
+        buf.write(text)
+
+
+# Text extractors for message content blocks, by block type (None: the block
+# carries no text). Other types are resolved on first sight and cached.
+_BLOCK_TEXT: dict[type, Optional[Callable[[Any], str]]] = {str: str}
+if TextBlock is not None:
+    _BLOCK_TEXT[TextBlock] = attrgetter("text")
+
+_UNRESOLVED = object()
+
+
+def _resolve_block_text(block: Any) -> Optional[Callable[[Any], str]]:
+    """Find and cache the text extractor for a block type not seen before."""
+    extract = attrgetter("text") if hasattr(block, "text") else None
+    _BLOCK_TEXT[type(block)] = extract
+    return extract
+
+
+def _partial_text(message: Any) -> Optional[str]:
+    """Text delta carried by a partial-message stream event, if any."""
+    event = getattr(message, "event", None)
+    if isinstance(event, dict) and event.get("type") == "content_block_delta":
+        delta = event.get("delta") or {}
+        if delta.get("type") == "text_delta":
+            return delta.get("text")
+    return None
+
+
+@dataclass(**({"slots": True} if sys.version_info >= (3, 10) else {}))
 class AgentResult:
     """Result from an agent task execution."""
     task_id: str
@@ -22,6 +110,30 @@ class AgentResult:
     error: Optional[str] = None
 
 
+class AgentStream:
+    """
+    Text of an agent run, yielded as it arrives (see BaseAgent.run_stream).
+
+    ``result`` is None until the stream is exhausted, then holds the run's
+    AgentResult.
+    """
+
+    def __init__(self, events: AsyncIterator[Any]):
+        self._events = events
+        self.result: Optional[AgentResult] = None
+
+    def __aiter__(self) -> "AgentStream":
+        return self
+
+    async def __anext__(self) -> str:
+        event = await self._events.__anext__()
+        if isinstance(event, AgentResult):
+            self.result = event
+            await self._events.aclose()
+            raise StopAsyncIteration
+        return event
+
+
 class BaseAgent:
     """
     Base wrapper for Claude Agent SDK.
@@ -31,6 +143,10 @@ class BaseAgent:
     - Session tracking (for resumption)
     - Audit logging hooks
     - Structured result handling
+
+    With ``persistent_session`` enabled, tasks that do not resume a session
+    share one long-lived SDK client (one CLI subprocess) instead of spawning
+    a new one per task. Call ``aclose()`` when done with the agent.
     """
 
     def __init__(
@@ -38,20 +154,55 @@ class BaseAgent:
         name: str,
         system_prompt: str,
         allowed_tools: list[str],
-        store_path: str = "./context_store"
+        store_path: str = "./context_store",
+        persistent_session: bool = False
     ):
         self.name = name
         self.system_prompt = system_prompt
         self.allowed_tools = allowed_tools
         self.store_path = store_path
-        self.context_store = ContextStore(store_path)
+        self.context_store = ContextStore.shared(store_path)
+        self.persistent_session = persistent_session
+
+        # Options shared by every run; run() copies it and sets cwd/resume
+        self._options_proto = ClaudeCodeOptions(
+            system_prompt=system_prompt,
+            allowed_tools=allowed_tools,
+            permission_mode="bypassPermissions",  # Auto-approve tool uses
+        ) if _SDK_AVAILABLE else None
+
+        # Long-lived SDK client, connected on first use in persistent mode
+        self._client = None
+        self._client_cwd: Optional[str] = None
+        self._client_lock: Optional[asyncio.Lock] = None
+
+        # Task contexts waiting to be written, by task ID, the latest
+        # (session_id, task_id) waiting to be saved, and the background
+        # task writing them
+        self._pending_saves: dict[str, TaskContext] = {}
+        self._pending_session: Optional[tuple[str, str]] = None
+        self._save_task: Optional[asyncio.Task] = None
+        # Held while a batch is written, so writes of the same files never overlap
+        self._persist_lock = threading.Lock()
+
+    async def aclose(self) -> None:
+        """Write pending task contexts and disconnect the persistent SDK client."""
+        await self.flush_saves()
+        await self._disconnect_client()
+
+    async def _disconnect_client(self) -> None:
+        """Disconnect the persistent SDK client, if connected."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.disconnect()
 
     async def run(
         self,
         task: str,
         working_dir: str = ".",
         task_id: Optional[str] = None,
-        resume_session: bool = False
+        resume_session: bool = False,
+        prefetched_context: Optional[Awaitable[Optional[TaskContext]]] = None
     ) -> AgentResult:
         """
         Run the agent on a task.
@@ -61,141 +212,251 @@ class BaseAgent:
             working_dir: Directory to work in
             task_id: Optional task ID (generated if not provided)
             resume_session: Whether to resume the last session
+            prefetched_context: Pending load of the prior context for task_id,
+                awaited instead of loading it here (see handoff_to)
 
         Returns:
             AgentResult with the outcome
         """
+        async for event in self._run_events(
+            task, working_dir, task_id, resume_session, prefetched_context, False
+        ):
+            pass
+        return event
+
+    def run_stream(
+        self,
+        task: str,
+        working_dir: str = ".",
+        task_id: Optional[str] = None,
+        resume_session: bool = False,
+        include_partial: bool = False
+    ) -> "AgentStream":
+        """
+        Run the agent on a task, streaming its text as it arrives.
+
+        Args:
+            task: The task description/prompt
+            working_dir: Directory to work in
+            task_id: Optional task ID (generated if not provided)
+            resume_session: Whether to resume the last session
+            include_partial: Ask the SDK for partial messages and yield their
+                text deltas; otherwise (or for a message that arrives without
+                deltas, or an SDK without partial messages) yield each
+                complete text block
+
+        Returns:
+            AgentStream to iterate with ``async for``; its ``result`` holds the
+            AgentResult once the stream is exhausted
+        """
+        return AgentStream(self._run_events(
+            task, working_dir, task_id, resume_session, None,
+            include_partial and _PARTIAL_MESSAGES
+        ))
+
+    async def _run_events(
+        self,
+        task: str,
+        working_dir: str,
+        task_id: Optional[str],
+        resume_session: bool,
+        prefetched_context: Optional[Awaitable[Optional[TaskContext]]],
+        include_partial: bool
+    ) -> AsyncIterator[Any]:
+        """Run a task, yielding text as it arrives and the AgentResult last."""
         # Generate task ID if not provided
         if task_id is None:
-            task_id = f"{self.name}-{uuid.uuid4().hex[:8]}"
+            task_id = f"{self.name}-{_TASK_ID_TAG}-{next(_TASK_COUNTER):x}"
 
         # Build context for hooks
-        hook_context = {
-            "agent_name": self.name,
-            "task_id": task_id,
-            "store_path": self.store_path,
-        }
+        hook_context = AuditContext(
+            agent_name=self.name,
+            task_id=task_id,
+            store_path=self.store_path,
+        )
 
-        # Log start
+        # Log start (queued for the audit writer, so a run that hangs or
+        # crashes still leaves its start entry)
         await log_agent_start(self.name, task, hook_context)
-
-        # Get session ID if resuming
-        session_id = None
-        if resume_session:
-            session_info = self.context_store.get_session(self.name)
-            if session_info:
-                session_id = session_info.get("session_id")
-
-        # Load any prior context for this task
-        prior_context = self._load_prior_context(task_id)
-
-        # Build the full prompt with context
-        full_prompt = self._build_prompt(task, prior_context)
+        completed_with: Optional[str] = None
 
         try:
-            # Import here to avoid issues if SDK not installed
-            from claude_code_sdk import query, ClaudeCodeOptions
-
-            # Run the agent via SDK
-            result_content = []
-            new_session_id = None
-
-            options = ClaudeCodeOptions(
-                system_prompt=self.system_prompt,
-                allowed_tools=self.allowed_tools,
-                cwd=working_dir,
-                permission_mode="bypassPermissions",  # Auto-approve tool uses
-            )
-
-            # Add resume if we have a session to continue
-            if session_id:
-                options.resume = session_id
-
-            async for message in query(prompt=full_prompt, options=options):
-                # Capture session ID from response
-                if hasattr(message, "session_id") and message.session_id:
-                    new_session_id = message.session_id
-
-                # Capture content - handle different message types
-                if hasattr(message, "content"):
-                    if isinstance(message.content, str):
-                        result_content.append(message.content)
-                    elif isinstance(message.content, list):
-                        for block in message.content:
-                            if hasattr(block, "text"):
-                                result_content.append(block.text)
-                            elif isinstance(block, str):
-                                result_content.append(block)
-
-            final_content = "\n".join(filter(None, result_content))
-
-            # Save session for future resumption
-            if new_session_id:
-                self.context_store.save_session(self.name, new_session_id, task_id)
-
-            # Create result
-            result = AgentResult(
-                task_id=task_id,
-                session_id=new_session_id,
-                content=final_content,
-                success=True
-            )
-
-            # Save task context
-            self._save_task_context(task_id, task, result)
-
-            # Log completion
-            await log_agent_complete(self.name, final_content, hook_context)
-
-            return result
-
-        except ImportError:
-            # SDK not installed - provide helpful error
-            return AgentResult(
-                task_id=task_id,
-                session_id=None,
-                content="",
-                success=False,
-                error="Claude Code SDK not installed. Run: pip install claude-code-sdk"
-            )
-
-        except Exception as e:
-            # Handle other errors
-            return AgentResult(
-                task_id=task_id,
-                session_id=session_id,
-                content="",
-                success=False,
-                error=str(e)
-            )
+            # Get session ID if resuming
+            session_id = None
+            if resume_session:
+                if self._pending_session is not None:
+                    session_id = self._pending_session[0]
+                else:
+                    session_info = await self.context_store.aget_session(self.name)
+                    if session_info:
+                        session_id = session_info.get("session_id")
+
+            # Load any prior context for this task (store reads run in a worker
+            # thread so other agents' streams keep flowing)
+            if prefetched_context is not None:
+                prior_context = await prefetched_context
+            else:
+                prior_context = await asyncio.to_thread(self._load_prior_context, task_id)
+
+            # Build the full prompt with context
+            full_prompt = self._build_prompt(task, prior_context)
+
+            if not _SDK_AVAILABLE:
+                # SDK not installed - provide helpful error
+                yield AgentResult(
+                    task_id=task_id,
+                    session_id=None,
+                    content="",
+                    success=False,
+                    error="Claude Code SDK not installed. Run: pip install claude-code-sdk"
+                )
+                return
+
+            try:
+                # Run the agent via SDK
+                result_content = io.StringIO()
+                new_session_id = None
+
+                # Partial messages are an option of the query, so those runs do
+                # not go through the long-lived client
+                if (
+                    self.persistent_session and ClaudeSDKClient is not None
+                    and not session_id and not include_partial
+                ):
+                    messages = self._client_messages(full_prompt, working_dir)
+                else:
+                    options = copy.copy(self._options_proto)
+                    options.cwd = working_dir
+
+                    # Add resume if we have a session to continue
+                    if session_id:
+                        options.resume = session_id
+                    if include_partial:
+                        options.include_partial_messages = True
+
+                    messages = query(prompt=full_prompt, options=options)
+
+                # Whether the current message's text already went out as deltas
+                streamed = False
+
+                async for message in messages:
+                    # Capture session ID from response
+                    message_session_id = getattr(message, "session_id", None)
+                    if message_session_id:
+                        new_session_id = message_session_id
+
+                    # Stream event envelopes carry the text deltas of partial
+                    # messages; the complete messages still follow them
+                    if include_partial:
+                        delta = _partial_text(message)
+                        if delta:
+                            streamed = True
+                            yield delta
+
+                    # Capture content - handle different message types
+                    content = getattr(message, "content", None)
+                    if isinstance(content, str):
+                        _append_text(result_content, content)
+                        if content and not streamed:
+                            yield content
+                    elif isinstance(content, list):
+                        for block in content:
+                            extract = _BLOCK_TEXT.get(type(block), _UNRESOLVED)
+                            if extract is _UNRESOLVED:
+                                extract = _resolve_block_text(block)
+                            if extract is not None:
+                                text = extract(block)
+                                _append_text(result_content, text)
+                                if text and not streamed:
+                                    yield text
+                    if content is not None:
+                        streamed = False
+
+                final_content = result_content.getvalue()
+
+                # Save session for future resumption (written with the task context)
+                if new_session_id:
+                    self._pending_session = (new_session_id, task_id)
+
+                # Create result
+                result = AgentResult(
+                    task_id=task_id,
+                    session_id=new_session_id,
+                    content=final_content,
+                    success=True
+                )
+
+                # Save task context
+                self._save_task_context(task_id, task, result)
+
+                # Log completion
+                completed_with = final_content
+
+                yield result
+
+            except Exception as e:
+                # Handle other errors
+                yield AgentResult(
+                    task_id=task_id,
+                    session_id=session_id,
+                    content="",
+                    success=False,
+                    error=str(e)
+                )
+        finally:
+            # Logged after the task context is queued, and even when the
+            # consumer stops reading once it has the result
+            if completed_with is not None:
+                await log_agent_complete(self.name, completed_with, hook_context)
+
+    async def _client_messages(self, prompt: str, working_dir: str) -> AsyncIterator:
+        """Send a prompt on the persistent client and yield its response messages."""
+        if self._client_lock is None:
+            self._client_lock = asyncio.Lock()
+
+        # One conversation turn at a time on the shared client
+        async with self._client_lock:
+            if self._client is not None and self._client_cwd != working_dir:
+                await self._disconnect_client()
+
+            if self._client is None:
+                options = copy.copy(self._options_proto)
+                options.cwd = working_dir
+                client = ClaudeSDKClient(options=options)
+                await client.connect()
+                self._client, self._client_cwd = client, working_dir
+
+            await self._client.query(prompt)
+            async for message in self._client.receive_response():
+                yield message
 
     def _build_prompt(self, task: str, prior_context: Optional[TaskContext]) -> str:
         """Build the full prompt including any prior context."""
-        parts = []
-
-        # Add prior context if available
-        if prior_context:
-            parts.append("## Prior Context")
-            parts.append(f"Task ID: {prior_context.task_id}")
-            parts.append(f"Status: {prior_context.status}")
-
-            if prior_context.files_changed:
-                parts.append(f"Files previously changed: {', '.join(prior_context.files_changed)}")
-
-            if prior_context.decisions:
-                parts.append("Previous decisions:")
-                for decision in prior_context.decisions:
-                    parts.append(f"  - {decision}")
-
-            parts.append("")  # Blank line
+        if prior_context is None:
+            return task
 
-        # Add the actual task
-        parts.append(task)
+        files_line = (
+            f"Files previously changed: {', '.join(prior_context.files_changed)}\n"
+            if prior_context.files_changed else ""
+        )
+        decisions_lines = (
+            "Previous decisions:\n" + "".join(f"  - {decision}\n" for decision in prior_context.decisions)
+            if prior_context.decisions else ""
+        )
 
-        return "\n".join(parts)
+        return (
+            f"## Prior Context\n"
+            f"Task ID: {prior_context.task_id}\n"
+            f"Status: {prior_context.status}\n"
+            f"{files_line}{decisions_lines}\n"
+            f"{task}"
+        )
 
     def _load_prior_context(self, task_id: str) -> Optional[TaskContext]:
         """Load prior context for a task if it exists."""
+        pending = self._pending_saves.get(task_id)
+        if pending is not None:
+            return pending
         return self.context_store.get_task(task_id)
 
     def _save_task_context(
@@ -205,13 +466,11 @@ class BaseAgent:
         result: AgentResult
     ) -> None:
         """Save task context for cross-agent sharing."""
-        from datetime import datetime
-
         context = TaskContext(
             task_id=task_id,
             agent=self.name,
-            timestamp=datetime.now().isoformat(),
-            description=description[:500],  # Truncate long descriptions
+            timestamp=audit_timestamp(),
+            description=description[:_DESCRIPTION_LIMIT],
             files_changed=result.files_changed,
             decisions=result.decisions,
             findings=[],
@@ -219,7 +478,57 @@ class BaseAgent:
             status="completed" if result.success else "failed"
         )
 
-        self.context_store.save_task(context)
+        # Queue the write; a background task persists queued contexts in batches
+        self._pending_saves[task_id] = context
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.get_running_loop().create_task(self._write_pending_saves())
+
+    async def _write_pending_saves(self) -> None:
+        """Write queued task contexts and sessions in batches until none are left."""
+        batch: list[TaskContext] = []
+        session: Optional[tuple[str, str]] = None
+        try:
+            while self._pending_saves or self._pending_session is not None:
+                batch = list(self._pending_saves.values())
+                session = self._pending_session
+                # One thread hop per batch, however many saves it coalesces
+                await asyncio.to_thread(self._persist, batch, session)
+                for context in batch:
+                    if self._pending_saves.get(context.task_id) is context:
+                        del self._pending_saves[context.task_id]
+                if self._pending_session is session:
+                    self._pending_session = None
+                batch, session = [], None
+        except asyncio.CancelledError:
+            # The event loop is shutting down. The worker thread still writes
+            # the batch in flight; write whatever was queued after it now
+            # (_persist waits for the worker to finish first).
+            in_flight = {id(context) for context in batch}
+            rest = [c for c in self._pending_saves.values() if id(c) not in in_flight]
+            rest_session = self._pending_session if self._pending_session is not session else None
+            self._pending_saves.clear()
+            self._pending_session = None
+            if rest or rest_session is not None:
+                self._persist(rest, rest_session)
+            raise
+
+    def _persist(self, contexts: list[TaskContext], session: Optional[tuple[str, str]]) -> None:
+        """Write a batch of task contexts and the latest session (worker thread)."""
+        with self._persist_lock:
+            if contexts:
+                self.context_store.save_tasks(contexts)
+            if session is not None:
+                self.context_store.save_session(self.name, *session)
+
+    async def flush_saves(self) -> None:
+        """
+        Wait until all queued task contexts and sessions have been written.
+
+        run() returns before its context is on disk, so call this (or
+        aclose()) before anything else reads the task from the store.
+        """
+        if self._save_task is not None:
+            await self._save_task
 
     async def handoff_to(
         self,
@@ -232,9 +541,19 @@ class BaseAgent:
 
         The target agent will receive context from this agent's work.
         """
-        # The target agent will automatically load context via task_id
-        return await target_agent.run(
-            task=task,
-            task_id=task_id,
-            resume_session=False  # Don't resume - this is a handoff
-        )
+        # The target agent will automatically load context via task_id,
+        # so this agent's queued contexts must be on disk first
+        await self.flush_saves()
+
+        # Read the context in a worker thread while the target agent looks
+        # up its session, rather than blocking its run() on the disk read
+        prefetch = asyncio.ensure_future(asyncio.to_thread(target_agent._load_prior_context, task_id))
+        try:
+            return await target_agent.run(
+                task=task,
+                task_id=task_id,
+                resume_session=False,  # Don't resume - this is a handoff
+                prefetched_context=prefetch
+            )
+        finally:
+            prefetch.cancel()
@@ -1,12 +1,23 @@
 """CI/CD Agent - Jenkins build orchestration and Artifactory artifact management."""
 from __future__ import annotations
 
+import asyncio
+import os
 from typing import Optional
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 
+from integrations.artifactory import ArtifactoryClient, ArtifactoryConfig
+from integrations.jenkins import JenkinsClient, JenkinsConfig
 from .base import BaseAgent, AgentResult
+from .utilities.audit import (
+    AuditContext,
+    log_artifact_upload,
+    log_build_trigger,
+    log_deployment,
+    log_rollback,
+)
 
 
 class Environment(Enum):
@@ -78,6 +89,22 @@ When reporting results, always include:
 """
 
 
+# Approval gate per environment: (minimum approvals, error when there are
+# too few, error when approvers must be distinct but are not)
+_APPROVAL_POLICY: dict[Environment, tuple[int, Optional[str], Optional[str]]] = {
+    Environment.DEV: (0, None, None),
+    Environment.STAGING: (1, "Staging deployment requires at least one approval", None),
+    Environment.PROD: (
+        2,
+        "Production deployment requires dual approval (two different approvers)",
+        "Production deployment requires two DIFFERENT approvers",
+    ),
+}
+
+# Build fields fetched while polling Jenkins - only what the result needs
+_BUILD_FIELDS = ("number", "result", "duration", "timestamp", "url", "artifacts[fileName]")
+
+
 class CICDAgent(BaseAgent):
     """
     CI/CD Agent for Jenkins builds and Artifactory artifact management.
@@ -127,6 +154,44 @@ class CICDAgent(BaseAgent):
         self.jenkins_config = jenkins_config or {}
         self.artifactory_config = artifactory_config or {}
 
+        # Clients are created on first use and kept open so their HTTP
+        # sessions (and pooled connections) are reused across calls
+        self._jenkins: Optional[JenkinsClient] = None
+        self._artifactory: Optional[ArtifactoryClient] = None
+
+    def _get_jenkins(self) -> JenkinsClient:
+        """Get the shared Jenkins client, creating it from config on first use."""
+        if self._jenkins is None:
+            config = JenkinsConfig(**self.jenkins_config) if self.jenkins_config else JenkinsConfig.from_env()
+            self._jenkins = JenkinsClient(config)
+        return self._jenkins
+
+    def _get_artifactory(self) -> ArtifactoryClient:
+        """Get the shared Artifactory client, creating it from config on first use."""
+        if self._artifactory is None:
+            config = ArtifactoryConfig(**self.artifactory_config) if self.artifactory_config else ArtifactoryConfig.from_env()
+            self._artifactory = ArtifactoryClient(config)
+        return self._artifactory
+
+    async def aclose(self) -> None:
+        """Close the Jenkins and Artifactory clients and the SDK client, if they were opened."""
+        jenkins, self._jenkins = self._jenkins, None
+        artifactory, self._artifactory = self._artifactory, None
+        if jenkins is not None:
+            await jenkins.close()
+        if artifactory is not None:
+            await artifactory.close()
+        await super().aclose()
+
+    def _audit_context(self, task_id: Optional[str], pipeline_id: Optional[str]) -> AuditContext:
+        """Build the audit context shared by every event of one operation."""
+        return AuditContext(
+            agent_name=self.name,
+            task_id=task_id,
+            pipeline_id=pipeline_id,
+            store_path=self.store_path,
+        )
+
     async def trigger_build(
         self,
         job_name: str,
@@ -148,24 +213,16 @@ class CICDAgent(BaseAgent):
         Returns:
             AgentResult with build status and details
         """
-        from integrations.jenkins import JenkinsClient, JenkinsConfig
-        from .utilities.audit import log_build_trigger
-
-        # Create client from config
-        config = JenkinsConfig(**self.jenkins_config) if self.jenkins_config else JenkinsConfig.from_env()
-        client = JenkinsClient(config)
+        client = self._get_jenkins()
 
         try:
             # Build context for audit
-            context = {
-                "agent_name": self.name,
-                "task_id": task_id,
-                "pipeline_id": pipeline_id,
-                "store_path": self.store_path,
-            }
+            context = self._audit_context(task_id, pipeline_id)
 
             # Trigger and wait for build
-            build_info = await client.trigger_and_wait(job_name, parameters)
+            build_info = await client.trigger_and_wait(
+                job_name, parameters, fields=_BUILD_FIELDS
+            )
 
             # Log the build trigger
             await log_build_trigger(
@@ -205,9 +262,6 @@ class CICDAgent(BaseAgent):
                 error=str(e)
             )
 
-        finally:
-            await client.close()
-
     async def upload_artifact(
         self,
         artifact_path: str,
@@ -233,21 +287,11 @@ class CICDAgent(BaseAgent):
         Returns:
             AgentResult with upload details including checksums
         """
-        from integrations.artifactory import ArtifactoryClient, ArtifactoryConfig
-        from .utilities.audit import log_artifact_upload
-
-        # Create client from config
-        config = ArtifactoryConfig(**self.artifactory_config) if self.artifactory_config else ArtifactoryConfig.from_env()
-        client = ArtifactoryClient(config)
+        client = self._get_artifactory()
 
         try:
             # Build context for audit
-            context = {
-                "agent_name": self.name,
-                "task_id": task_id,
-                "pipeline_id": pipeline_id,
-                "store_path": self.store_path,
-            }
+            context = self._audit_context(task_id, pipeline_id)
 
             # Upload artifact
             local_path = Path(artifact_path)
@@ -297,8 +341,32 @@ class CICDAgent(BaseAgent):
                 error=str(e)
             )
 
-        finally:
-            await client.close()
+    async def upload_artifacts_bulk(
+        self,
+        items: list[dict],
+        max_parallel: Optional[int] = None
+    ) -> list[AgentResult]:
+        """
+        Upload several artifacts concurrently.
+
+        Uploads share the agent's Artifactory client and run at most
+        max_parallel at a time. Pass max_parallel=1 to upload serially,
+        e.g. when the server does not handle parallel PUTs well.
+
+        Args:
+            items: upload_artifact keyword arguments, one dict per artifact
+            max_parallel: Concurrent upload limit (defaults to min(8, CPU count))
+
+        Returns:
+            AgentResult per item, in the same order as items
+        """
+        semaphore = asyncio.Semaphore(max_parallel or min(8, os.cpu_count() or 4))
+
+        async def upload_one(item: dict) -> AgentResult:
+            async with semaphore:
+                return await self.upload_artifact(**item)
+
+        return list(await asyncio.gather(*(upload_one(item) for item in items)))
 
     async def deploy(
         self,
@@ -325,43 +393,26 @@ class CICDAgent(BaseAgent):
         Returns:
             AgentResult with deployment status
         """
-        from .utilities.audit import log_deployment
-
         # Build context for audit
-        context = {
-            "agent_name": self.name,
-            "task_id": task_id,
-            "pipeline_id": pipeline_id,
-            "store_path": self.store_path,
-        }
+        context = self._audit_context(task_id, pipeline_id)
+        env_val = environment.value
 
         # Validate approval requirements
         approved_by = approved_by or []
-        if environment == Environment.STAGING and len(approved_by) < 1:
-            return AgentResult(
-                task_id=task_id or "cicd-deploy-error",
-                session_id=None,
-                content="",
-                success=False,
-                error="Staging deployment requires at least one approval"
-            )
-
-        if environment == Environment.PROD and len(approved_by) < 2:
+        min_approvals, missing_error, distinct_error = _APPROVAL_POLICY[environment]
+        error = None
+        if len(approved_by) < min_approvals:
+            error = missing_error
+        elif distinct_error and len(set(approved_by)) < min_approvals:
+            error = distinct_error
+
+        if error:
             return AgentResult(
                 task_id=task_id or "cicd-deploy-error",
                 session_id=None,
                 content="",
                 success=False,
-                error="Production deployment requires dual approval (two different approvers)"
-            )
-
-        if environment == Environment.PROD and len(set(approved_by)) < 2:
-            return AgentResult(
-                task_id=task_id or "cicd-deploy-error",
-                session_id=None,
-                content="",
-                success=False,
-                error="Production deployment requires two DIFFERENT approvers"
+                error=error
             )
 
         try:
@@ -372,9 +423,9 @@ class CICDAgent(BaseAgent):
             # 4. Verify deployment health
 
             # For now, use the agent's AI capabilities to reason about deployment
-            deployment_task = f"""Deploy artifact version {artifact_version} to {environment.value}.
+            deployment_task = f"""Deploy artifact version {artifact_version} to {env_val}.
 
-Environment: {environment.value}
+Environment: {env_val}
 Artifact Version: {artifact_version}
 Artifact SHA-256: {artifact_sha256}
 Approved By: {', '.join(approved_by) if approved_by else 'N/A (dev environment)'}
@@ -390,7 +441,7 @@ Verify the deployment was successful."""
 
             # Log the deployment
             await log_deployment(
-                environment=environment.value,
+                environment=env_val,
                 artifact_version=artifact_version,
                 deployed_by=self.name,
                 approved_by=approved_by,
@@ -404,7 +455,7 @@ Verify the deployment was successful."""
         except Exception as e:
             # Log failed deployment
             await log_deployment(
-                environment=environment.value,
+                environment=env_val,
                 artifact_version=artifact_version,
                 deployed_by=self.name,
                 approved_by=approved_by,
@@ -446,21 +497,15 @@ Verify the deployment was successful."""
         Returns:
             AgentResult with rollback status
         """
-        from .utilities.audit import log_rollback
-
         # Build context for audit
-        context = {
-            "agent_name": self.name,
-            "task_id": task_id,
-            "pipeline_id": pipeline_id,
-            "store_path": self.store_path,
-        }
+        context = self._audit_context(task_id, pipeline_id)
+        env_val = environment.value
 
         try:
             # Execute rollback using agent's AI capabilities
-            rollback_task = f"""Rollback {environment.value} to version {target_version}.
+            rollback_task = f"""Rollback {env_val} to version {target_version}.
 
-Environment: {environment.value}
+Environment: {env_val}
 Target Version: {target_version}
 Reason: {reason}
 Approved By: {approved_by}
@@ -479,7 +524,7 @@ Execute the rollback procedure:
 
             # Log the rollback
             await log_rollback(
-                environment=environment.value,
+                environment=env_val,
                 from_version="current",
                 to_version=target_version,
                 reason=reason,
@@ -514,7 +559,8 @@ Execute the rollback procedure:
         Returns:
             AgentResult with current deployment status
         """
-        status_task = f"""Check the deployment status of the {environment.value} environment.
+        env_val = environment.value
+        status_task = f"""Check the deployment status of the {env_val} environment.
 
 Report:
 1. Currently deployed version
@@ -525,5 +571,5 @@ Report:
         return await self.run(
             task=status_task,
             working_dir=working_dir,
-            task_id=f"cicd-status-{environment.value}"
+            task_id=f"cicd-status-{env_val}"
         )
@@ -1,6 +1,7 @@
 """Cyber Agent - Security scanning and vulnerability detection."""
 from __future__ import annotations
 
+import re
 from typing import Optional
 from dataclasses import dataclass
 from enum import Enum
@@ -8,6 +9,12 @@ from enum import Enum
 from .base import BaseAgent, AgentResult
 
 
+# Decision markers in a scan report ("**BLOCK**" or "DECISION: BLOCK", any case)
+_DECISION_RE = re.compile(r"\*\*(BLOCK|WARN|APPROVE)\*\*|DECISION: (BLOCK|WARN|APPROVE)", re.IGNORECASE)
+_CRITICAL_RE = re.compile("CRITICAL", re.IGNORECASE)
+_HIGH_RE = re.compile("HIGH", re.IGNORECASE)
+
+
 class SecuritySeverity(Enum):
     """Severity levels for security findings."""
     CRITICAL = "critical"
@@ -217,87 +224,7 @@ Provide a structured security report with:
 """
 
 
-class CyberAgent(BaseAgent):
-    """
-    Cyber Agent for security scanning and vulnerability detection.
-
-    Capabilities:
-    - Secrets detection
-    - OWASP Top 10 scanning
-    - Code security review
-    - Dependency checking
-    - Security policy enforcement
-    """
-
-    # Tools available - read-only for security
-    DEFAULT_TOOLS = [
-        "Read",      # Read files
-        "Glob",      # Find files by pattern
-        "Grep",      # Search for patterns (secrets, vulnerabilities)
-        "Bash",      # Run security tools (limited)
-    ]
-
-    def __init__(
-        self,
-        system_prompt: Optional[str] = None,
-        allowed_tools: Optional[list[str]] = None,
-        store_path: str = "./context_store"
-    ):
-        super().__init__(
-            name="cyber",
-            system_prompt=system_prompt or CYBER_SYSTEM_PROMPT,
-            allowed_tools=allowed_tools or self.DEFAULT_TOOLS,
-            store_path=store_path
-        )
-
-    async def scan(
-        self,
-        description: str,
-        working_dir: str = ".",
-        task_id: Optional[str] = None,
-        files_to_scan: Optional[list[str]] = None,
-        context: Optional[str] = None
-    ) -> AgentResult:
-        """
-        Run a security scan on code changes.
-
-        Args:
-            description: What was changed/implemented
-            working_dir: Directory to scan
-            task_id: Task ID for tracking
-            files_to_scan: Specific files to scan
-            context: Additional context about the changes
-
-        Returns:
-            AgentResult with security findings and decision
-        """
-        files_str = "\n".join(f"- {f}" for f in (files_to_scan or []))
-        if not files_str:
-            files_str = "Scan all recently changed files in the working directory"
-
-        task = SECURITY_SCAN_TEMPLATE.format(
-            context=context or description,
-            files=files_str
-        )
-
-        return await self.run(task, working_dir, task_id)
-
-    async def check_secrets(
-        self,
-        working_dir: str = ".",
-        task_id: Optional[str] = None
-    ) -> AgentResult:
-        """
-        Specifically scan for secrets and credentials.
-
-        Args:
-            working_dir: Directory to scan
-            task_id: Task ID for tracking
-
-        Returns:
-            AgentResult with secrets findings
-        """
-        task = """## Task: Secrets Detection Scan
+SECRETS_SCAN_TASK = """## Task: Secrets Detection Scan
 
 ### Requirements
 Scan the codebase for exposed secrets and credentials:
@@ -335,31 +262,12 @@ Report any secrets found with:
 - Type of secret
 - Recommendation (use env vars, secrets manager, etc.)
 """
-        return await self.run(task, working_dir, task_id)
 
-    async def check_owasp(
-        self,
-        working_dir: str = ".",
-        task_id: Optional[str] = None,
-        files_to_scan: Optional[list[str]] = None
-    ) -> AgentResult:
-        """
-        Scan for OWASP Top 10 vulnerabilities.
 
-        Args:
-            working_dir: Directory to scan
-            task_id: Task ID for tracking
-            files_to_scan: Specific files to check
-
-        Returns:
-            AgentResult with OWASP findings
-        """
-        files_str = "\n".join(f"- {f}" for f in (files_to_scan or []))
-
-        task = f"""## Task: OWASP Top 10 Security Scan
+OWASP_SCAN_TEMPLATE = """## Task: OWASP Top 10 Security Scan
 
 ### Files to Scan
-{files_str or "All application code in the working directory"}
+{files}
 
 ### Check for Each OWASP Category
 
@@ -420,24 +328,9 @@ For each finding:
 - Description
 - Fix recommendation
 """
-        return await self.run(task, working_dir, task_id)
 
-    async def review_dependencies(
-        self,
-        working_dir: str = ".",
-        task_id: Optional[str] = None
-    ) -> AgentResult:
-        """
-        Check dependencies for known vulnerabilities.
-
-        Args:
-            working_dir: Directory containing dependency files
-            task_id: Task ID for tracking
 
-        Returns:
-            AgentResult with dependency findings
-        """
-        task = """## Task: Dependency Security Review
+DEPENDENCY_REVIEW_TASK = """## Task: Dependency Security Review
 
 ### Requirements
 Check project dependencies for security issues:
@@ -466,6 +359,131 @@ Report:
 - Severity of each vulnerability
 - Recommended updates
 """
+
+
+class CyberAgent(BaseAgent):
+    """
+    Cyber Agent for security scanning and vulnerability detection.
+
+    Capabilities:
+    - Secrets detection
+    - OWASP Top 10 scanning
+    - Code security review
+    - Dependency checking
+    - Security policy enforcement
+    """
+
+    # Tools available - read-only for security
+    DEFAULT_TOOLS = [
+        "Read",      # Read files
+        "Glob",      # Find files by pattern
+        "Grep",      # Search for patterns (secrets, vulnerabilities)
+        "Bash",      # Run security tools (limited)
+    ]
+
+    def __init__(
+        self,
+        system_prompt: Optional[str] = None,
+        allowed_tools: Optional[list[str]] = None,
+        store_path: str = "./context_store"
+    ):
+        super().__init__(
+            name="cyber",
+            system_prompt=system_prompt or CYBER_SYSTEM_PROMPT,
+            allowed_tools=allowed_tools or self.DEFAULT_TOOLS,
+            store_path=store_path
+        )
+
+    async def scan(
+        self,
+        description: str,
+        working_dir: str = ".",
+        task_id: Optional[str] = None,
+        files_to_scan: Optional[list[str]] = None,
+        context: Optional[str] = None
+    ) -> AgentResult:
+        """
+        Run a security scan on code changes.
+
+        Args:
+            description: What was changed/implemented
+            working_dir: Directory to scan
+            task_id: Task ID for tracking
+            files_to_scan: Specific files to scan
+            context: Additional context about the changes
+
+        Returns:
+            AgentResult with security findings and decision
+        """
+        files_str = "\n".join(f"- {f}" for f in (files_to_scan or []))
+        if not files_str:
+            files_str = "Scan all recently changed files in the working directory"
+
+        task = SECURITY_SCAN_TEMPLATE.format(
+            context=context or description,
+            files=files_str
+        )
+
+        return await self.run(task, working_dir, task_id)
+
+    async def check_secrets(
+        self,
+        working_dir: str = ".",
+        task_id: Optional[str] = None
+    ) -> AgentResult:
+        """
+        Specifically scan for secrets and credentials.
+
+        Args:
+            working_dir: Directory to scan
+            task_id: Task ID for tracking
+
+        Returns:
+            AgentResult with secrets findings
+        """
+        task = SECRETS_SCAN_TASK
+        return await self.run(task, working_dir, task_id)
+
+    async def check_owasp(
+        self,
+        working_dir: str = ".",
+        task_id: Optional[str] = None,
+        files_to_scan: Optional[list[str]] = None
+    ) -> AgentResult:
+        """
+        Scan for OWASP Top 10 vulnerabilities.
+
+        Args:
+            working_dir: Directory to scan
+            task_id: Task ID for tracking
+            files_to_scan: Specific files to check
+
+        Returns:
+            AgentResult with OWASP findings
+        """
+        files_str = "\n".join(f"- {f}" for f in (files_to_scan or []))
+
+        task = OWASP_SCAN_TEMPLATE.format(
+            files=files_str or "All application code in the working directory"
+        )
+        return await self.run(task, working_dir, task_id)
+
+    async def review_dependencies(
+        self,
+        working_dir: str = ".",
+        task_id: Optional[str] = None
+    ) -> AgentResult:
+        """
+        Check dependencies for known vulnerabilities.
+
+        Args:
+            working_dir: Directory containing dependency files
+            task_id: Task ID for tracking
+
+        Returns:
+            AgentResult with dependency findings
+        """
+        task = DEPENDENCY_REVIEW_TASK
         return await self.run(task, working_dir, task_id)
 
     async def full_scan(
@@ -506,21 +524,23 @@ Report:
         Returns:
             Tuple of (decision: BLOCK/WARN/APPROVE, list of blocking issues)
         """
-        content = result.content.upper()
+        content = result.content
+        # Any BLOCK marker wins over WARN, and WARN over APPROVE
+        decisions = {(marked or stated).upper() for marked, stated in _DECISION_RE.findall(content)}
 
-        if "**BLOCK**" in content or "DECISION: BLOCK" in content:
+        if "BLOCK" in decisions:
             # Extract blocking issues
             blockers = []
-            if "CRITICAL" in content:
+            if _CRITICAL_RE.search(content):
                 blockers.append("Critical severity findings detected")
-            if "HIGH" in content:
+            if _HIGH_RE.search(content):
                 blockers.append("High severity findings detected")
             return "BLOCK", blockers
 
-        elif "**WARN**" in content or "DECISION: WARN" in content:
+        elif "WARN" in decisions:
             return "WARN", []
 
-        elif "**APPROVE**" in content or "DECISION: APPROVE" in content:
+        elif "APPROVE" in decisions:
             return "APPROVE", []
 
         # Default to WARN if unclear
@@ -69,8 +69,7 @@ class DevAgent(BaseAgent):
             AgentResult with design document
         """
         # Search component library for relevant components
-        library_components = self.component_library.search(description)
-        library_context = self.component_library.format_for_prompt(library_components[:5])
+        library_context = self.component_library.context_for(description)
 
         task = build_design_prompt(description, library_context)
         return await self.run(task, working_dir, task_id)
@@ -95,8 +94,7 @@ class DevAgent(BaseAgent):
             AgentResult with implementation details
         """
         # Search component library for relevant components
-        library_components = self.component_library.search(description)
-        library_context = self.component_library.format_for_prompt(library_components[:5])
+        library_context = self.component_library.context_for(description)
 
         task = build_task_prompt("feature", description, library_context, approved_design)
         return await self.run(task, working_dir, task_id)
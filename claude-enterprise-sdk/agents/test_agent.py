@@ -4,7 +4,7 @@ from __future__ import annotations
 from typing import Optional
 
 from .base import BaseAgent, AgentResult
-from prompts.tasks import build_task_prompt
+from prompts.tasks import build_task_prompt, compile_template
 
 
 TEST_SYSTEM_PROMPT = """You are a senior QA engineer and test automation specialist.
@@ -127,6 +127,54 @@ Provide:
 """
 
 
+RUN_TESTS_TEMPLATE = """## Task: Run Test Suite
+
+### Instructions
+1. Identify the test command for this project (check package.json, pyproject.toml, Makefile, etc.)
+2. Run the test suite{test_command}
+3. Report results including any failures
+4. If tests fail, analyze the failures
+
+### Output
+Provide:
+- Test command used
+- Pass/fail summary
+- Details of any failures
+- Coverage report if available
+"""
+
+
+COVERAGE_TEMPLATE = """## Task: Verify Test Coverage
+
+### Target Files
+{target_files}
+
+### Requirements
+1. Run coverage analysis
+2. Report coverage percentage for target files
+3. Identify any gaps in coverage
+4. Recommend additional tests if coverage is below 80%
+
+### Output
+Provide:
+- Coverage percentage per file
+- Overall coverage summary
+- Gaps in coverage
+- Recommended additional tests
+"""
+
+
+# Stand-ins for an empty file list in the prompts
+_NO_FILES_CHANGED = "Not specified - explore recent changes"
+_ALL_CHANGED_FILES = "All recently changed files"
+
+# Templates parsed once at import rather than on every call
+_render_test_generation = compile_template(TEST_GENERATION_TEMPLATE)
+_render_standalone_test = compile_template(STANDALONE_TEST_TEMPLATE)
+_render_run_tests = compile_template(RUN_TESTS_TEMPLATE)
+_render_coverage = compile_template(COVERAGE_TEMPLATE)
+
+
 class TestAgent(BaseAgent):
     """
     Test Agent for test generation and quality assurance.
@@ -182,11 +230,11 @@ class TestAgent(BaseAgent):
             AgentResult with test generation details
         """
         # Build prompt with Dev Agent context
-        files_str = "\n".join(f"- {f}" for f in (files_changed or []))
+        files_str = "- " + "\n- ".join(files_changed) if files_changed else _NO_FILES_CHANGED
 
-        task = TEST_GENERATION_TEMPLATE.format(
+        task = _render_test_generation(
             dev_context=dev_context or description,
-            files_changed=files_str or "Not specified - explore recent changes"
+            files_changed=files_str
         )
 
         return await self.run(task, working_dir, task_id)
@@ -208,21 +256,7 @@ class TestAgent(BaseAgent):
         Returns:
             AgentResult with test results
         """
-        task = f"""## Task: Run Test Suite
-
-### Instructions
-1. Identify the test command for this project (check package.json, pyproject.toml, Makefile, etc.)
-2. Run the test suite{f': {test_command}' if test_command else ''}
-3. Report results including any failures
-4. If tests fail, analyze the failures
-
-### Output
-Provide:
-- Test command used
-- Pass/fail summary
-- Details of any failures
-- Coverage report if available
-"""
+        task = _render_run_tests(test_command=f": {test_command}" if test_command else "")
         return await self.run(task, working_dir, task_id)
 
     async def verify_coverage(
@@ -242,26 +276,9 @@ Provide:
         Returns:
             AgentResult with coverage analysis
         """
-        files_str = "\n".join(f"- {f}" for f in (target_files or []))
+        files_str = "- " + "\n- ".join(target_files) if target_files else _ALL_CHANGED_FILES
 
-        task = f"""## Task: Verify Test Coverage
-
-### Target Files
-{files_str or "All recently changed files"}
-
-### Requirements
-1. Run coverage analysis
-2. Report coverage percentage for target files
-3. Identify any gaps in coverage
-4. Recommend additional tests if coverage is below 80%
-
-### Output
-Provide:
-- Coverage percentage per file
-- Overall coverage summary
-- Gaps in coverage
-- Recommended additional tests
-"""
+        task = _render_coverage(target_files=files_str)
         return await self.run(task, working_dir, task_id)
 
     async def explore_and_test(
@@ -285,7 +302,7 @@ Provide:
         Returns:
             AgentResult with exploration findings and test generation details
         """
-        task = STANDALONE_TEST_TEMPLATE.format(
+        task = _render_standalone_test(
             description=description,
             working_dir=working_dir
         )
@@ -1,5 +1,5 @@
 """Utilities for agent lifecycle events and audit logging."""
 
-from .audit import get_audit_hooks, log_tool_use
+from .audit import AuditContext, get_audit_hooks, log_tool_use
 
-__all__ = ["get_audit_hooks", "log_tool_use"]
+__all__ = ["AuditContext", "get_audit_hooks", "log_tool_use"]
@@ -1,104 +1,539 @@
 """Audit hooks for logging agent activity."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import mmap
+import os
+import random
+import re
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterator, Mapping, Optional
+
+from config import get_config
+
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to the stdlib encoder
+    orjson = None
+
+
+# Coalescing bounds for the background writer: a batch is flushed once it
+# reaches _FLUSH_BYTES or once its oldest entry is _FLUSH_INTERVAL seconds old
+_FLUSH_BYTES = 64 * 1024
+_FLUSH_INTERVAL = 0.05
+
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+# Entries are queued without their line terminator; every line in a batch
+# shares this one buffer in the writev() iovec array
+_NL = b"\n"
+
+# fdatasync is not available everywhere (e.g. macOS)
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+# Keep os.open() from translating newlines on Windows
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+# Sidecar index record (audit.idx), one per log line:
+# task_id hash (u64), agent hash (u32), byte offset (u64), line length (u32)
+_IDX_RECORD = struct.Struct("<QIQI")
+
+# Timestamps are derived from a wall-clock reading taken at most
+# _CLOCK_RESYNC seconds ago plus the monotonic time elapsed since, so
+# clock adjustments (NTP, DST) are picked up within that window
+_CLOCK_RESYNC = 60.0
+_clock_base = (time.time(), time.monotonic())
+
+# The formatted "YYYY-MM-DDTHH:MM:SS" of the last whole second stamped, so
+# entries within the same second only format their microseconds
+_iso_second = (None, "")
+
+
+def _now_iso() -> str:
+    """Current local time as an ISO 8601 string, for audit timestamps."""
+    global _clock_base, _iso_second
+    wall, mono = _clock_base
+    now = time.monotonic()
+    if now - mono > _CLOCK_RESYNC:
+        wall, mono = _clock_base = (time.time(), now)
+
+    ts = wall + (now - mono)
+    second = int(ts)
+    micro = round((ts - second) * 1e6)
+    if micro == 1_000_000:
+        second, micro = second + 1, 0
+
+    cached_second, prefix = _iso_second
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second).isoformat()
+        _iso_second = (second, prefix)
+    # Same shape as datetime.isoformat(), which drops a zero fraction
+    return f"{prefix}.{micro:06d}" if micro else prefix
+
+
+def _key_hash(value: Any, digest_size: int) -> int:
+    """Stable hash of an index key; 0 when the key is missing."""
+    if not value or not isinstance(value, str):
+        return 0
+    digest = hashlib.blake2b(value.encode(), digest_size=digest_size).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _writev_all(fd: int, bufs: list[bytes]) -> None:
+    """Write all buffers with as few syscalls as the platform allows."""
+    if not hasattr(os, "writev"):
+        data = memoryview(b"".join(bufs))
+        while data:
+            data = data[os.write(fd, data):]
+        return
+
+    # Keep each entry and its newline in the same call
+    step = max(_IOV_MAX - _IOV_MAX % 2, 2)
+    for i in range(0, len(bufs), step):
+        chunk = bufs[i:i + step]
+        written = os.writev(fd, chunk)
+        # Finish a short write without splitting the remaining lines up
+        rest = memoryview(b"".join(chunk))[written:]
+        while rest:
+            rest = rest[os.write(fd, rest):]
+
+
+class _AuditWriter:
+    """
+    Background appender for a single audit log file.
+
+    Log calls only enqueue pre-serialized entries; one task per file drains
+    the queue, coalesces entries up to the size/age bounds above and
+    flushes each batch from a worker thread with a single writev() +
+    fdatasync() on a descriptor that stays open for the life of the process.
+    Each flush also appends one record per line to the audit.idx sidecar.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.index_path = path.with_suffix(".idx")
+        self.queue: Optional[asyncio.Queue[tuple]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._fd: Optional[int] = None
+        self._idx_fd: Optional[int] = None
+        self._lock = threading.Lock()
+
+    async def submit(
+        self,
+        line: bytes,
+        task_id: Optional[str] = None,
+        agent: Optional[str] = None
+    ) -> None:
+        """Queue a serialized entry (no trailing newline), starting the drain task if needed."""
+        if self._task is None or self._task.done():
+            self.queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run(self.queue))
+        self.queue.put_nowait((line, task_id, agent))
+
+    async def flush(self) -> None:
+        """Wait until every queued line has been written."""
+        if self.queue is not None and self._task is not None and not self._task.done():
+            await self.queue.join()
+
+    async def _run(self, queue: asyncio.Queue[tuple]) -> None:
+        loop = asyncio.get_running_loop()
+        pending: list[tuple] = []
+        try:
+            while True:
+                pending.append(await queue.get())
+                size = len(pending[0][0])
+                deadline = loop.time() + _FLUSH_INTERVAL
+
+                while size < _FLUSH_BYTES:
+                    try:
+                        item = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        # asyncio.wait rather than wait_for, which on 3.11 can
+                        # swallow a shutdown cancel that races a completed get
+                        getter = asyncio.ensure_future(queue.get())
+                        try:
+                            done, _ = await asyncio.wait((getter,), timeout=timeout)
+                        except asyncio.CancelledError:
+                            if getter.done():
+                                pending.append(getter.result())
+                            getter.cancel()
+                            raise
+                        if not done:
+                            getter.cancel()
+                            break
+                        item = getter.result()
+                    pending.append(item)
+                    size += len(item[0])
+
+                # Only the drain task pays for the thread hop; the blocking
+                # write + sync never runs on the event loop itself
+                batch, pending = pending, []
+                try:
+                    await asyncio.to_thread(self._flush, batch)
+                finally:
+                    for _ in batch:
+                        queue.task_done()
+        except asyncio.CancelledError:
+            # The event loop is shutting down - persist anything still queued
+            while not queue.empty():
+                pending.append(queue.get_nowait())
+            if pending:
+                self._flush(pending)
+            raise
+
+    def _open(self) -> None:
+        """(Re)open the log and its index, e.g. after the store was cleared."""
+        for fd in (self._fd, self._idx_fd):
+            if fd is not None:
+                os.close(fd)
+
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | _O_BINARY
+        self._fd = os.open(self.path, flags, 0o644)
+        # A fresh log invalidates whatever index was left behind
+        if os.fstat(self._fd).st_size == 0:
+            flags |= os.O_TRUNC
+        self._idx_fd = os.open(self.index_path, flags, 0o644)
+        self._backfill_index()
+
+    def _backfill_index(self) -> None:
+        """
+        Index the log lines the sidecar does not cover yet.
+
+        That is the whole log when it predates the index, or the tail left
+        behind when a process stopped between writing the log and its
+        index. An index that is not a clean prefix of the log is rebuilt.
+        """
+        size = os.fstat(self._fd).st_size
+        data = self.index_path.read_bytes()
+        usable = len(data) - len(data) % _IDX_RECORD.size
+
+        covered = end = 0
+        for _, _, offset, length in _IDX_RECORD.iter_unpack(data[:usable]):
+            covered += length
+            end = max(end, offset + length)
+        if covered == size and usable == len(data):
+            return
+        if covered != end or covered > size:
+            covered = usable = 0
+        os.ftruncate(self._idx_fd, usable)
+
+        records = []
+        with open(self.path, "rb") as f:
+            f.seek(covered)
+            offset = covered
+            while offset < size:
+                line = f.readline(size - offset)
+                try:
+                    entry = _loads(line)
+                except ValueError:
+                    entry = None
+                if not isinstance(entry, dict):
+                    entry = {}
+                records.append(_IDX_RECORD.pack(
+                    _key_hash(entry.get("task_id"), 8),
+                    _key_hash(entry.get("agent"), 4),
+                    offset, len(line)
+                ))
+                offset += len(line)
+        os.write(self._idx_fd, b"".join(records))
+
+    def _flush(self, batch: list[tuple]) -> None:
+        with self._lock:
+            if (
+                self._fd is None
+                or os.fstat(self._fd).st_nlink == 0
+                or os.fstat(self._idx_fd).st_nlink == 0
+            ):
+                self._open()
+
+            bufs = [_NL] * (2 * len(batch))
+            bufs[::2] = [item[0] for item in batch]
+            _writev_all(self._fd, bufs)
+            _fdatasync(self._fd)
+
+            # O_APPEND leaves our offset at the end of what was just written
+            offset = os.lseek(self._fd, 0, os.SEEK_CUR) - sum(map(len, bufs))
+            records = []
+            for entry, task_id, agent in batch:
+                length = len(entry) + 1
+                records.append(_IDX_RECORD.pack(
+                    _key_hash(task_id, 8), _key_hash(agent, 4), offset, length
+                ))
+                offset += length
+            os.write(self._idx_fd, b"".join(records))
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode values the stdlib json module does not understand."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def _dumps(value: Any) -> bytes:
+        """Serialize a single JSON value."""
+        return orjson.dumps(value)
+
+    _loads = orjson.loads
+else:
+    def _dumps(value: Any) -> bytes:
+        """Serialize a single JSON value."""
+        return json.dumps(value, separators=(",", ":"), default=_json_default).encode()
+
+    _loads = json.loads
+
+
+class _EventEncoder:
+    """
+    Encoder for one kind of audit event.
+
+    Every entry starts with its timestamp, followed by the constant event
+    name (if any) and then ``keys`` in order. The key fragments are
+    serialized once here, so encoding an entry only serializes its values
+    and joins them - no intermediate dict is built.
+    """
+
+    def __init__(self, event: str | None, *keys: str):
+        """
+        Args:
+            event: Value of the "event" field, or None to omit it
+            *keys: Remaining field names, in the order values are passed
+        """
+        self.event = event
+        self.keys = keys
+
+        event_field = b',"event":' + _dumps(event) if event is not None else b""
+        self._fragments = [b'{"timestamp":']
+        for i, key in enumerate(keys):
+            self._fragments.append((event_field if i == 0 else b"") + b"," + _dumps(key) + b":")
+
+    def encode(self, values: tuple) -> bytes:
+        """Serialize (timestamp, *values) to a JSON entry without its newline."""
+        parts = [part for pair in zip(self._fragments, map(_dumps, values)) for part in pair]
+        parts.append(b"}")
+        return b"".join(parts)
+
+    def as_dict(self, values: tuple) -> dict:
+        """Build the entry (timestamp, *values) as a dict, for in-memory sinks."""
+        entry = {"timestamp": values[0]}
+        if self.event is not None:
+            entry["event"] = self.event
+        entry.update(zip(self.keys, values[1:]))
+        return entry
+
+
+@dataclass(frozen=True, **({"slots": True} if sys.version_info >= (3, 10) else {}))
+class AuditContext:
+    """Who an audit event belongs to and which store it is written to."""
+    agent_name: str = "unknown"
+    task_id: Optional[str] = None
+    pipeline_id: Optional[str] = None
+    store_path: str = "./context_store"
+
+
+def _as_context(context: AuditContext | Mapping[str, Any]) -> AuditContext:
+    """Accept the dict contexts the hooks originally took, as well as AuditContext."""
+    if isinstance(context, AuditContext):
+        return context
+    return AuditContext(
+        agent_name=context.get("agent_name", "unknown"),
+        task_id=context.get("task_id"),
+        pipeline_id=context.get("pipeline_id"),
+        store_path=context.get("store_path", "./context_store"),
+    )
+
+
+# Stores that keep entries in memory instead of on disk, e.g. for tests
+# and CI simulations: AuditContext(store_path=":memory:")
+_MEMORY_LOG: list[dict] = []
+_SINKS: dict[str, Callable[[dict], None]] = {":memory:": _MEMORY_LOG.append}
+
+
+# Writers keyed by store_path, so the log path is built and its directory
+# created once per store rather than on every event
+_WRITERS: dict[str, _AuditWriter] = {}
+
+
+def _get_writer(store_path: str) -> _AuditWriter:
+    """Get the writer for a store, creating the store directory on first use."""
+    writer = _WRITERS.get(store_path)
+    if writer is None:
+        path = Path(store_path)
+        path.mkdir(parents=True, exist_ok=True)
+        writer = _WRITERS[store_path] = _AuditWriter(path / "audit.jsonl")
+    return writer
+
+
+async def _submit(
+    context: AuditContext,
+    encoder: _EventEncoder,
+    values: tuple,
+    task_id: str | None = None,
+    agent: str | None = None
+) -> None:
+    """Encode an entry and hand it to the writer (or sink) for its store."""
+    sink = _SINKS.get(context.store_path)
+    if sink is not None:
+        sink(encoder.as_dict(values))
+        return
+
+    await _get_writer(context.store_path).submit(encoder.encode(values), task_id, agent)
+
+
+async def flush_audit_log() -> None:
+    """Wait for all pending audit entries to reach disk."""
+    for writer in list(_WRITERS.values()):
+        await writer.flush()
+
+
+_encode_tool_use = _EventEncoder(None, "agent", "task_id", "tool", "input", "success")
+
+# Tool-use entries are by far the most frequent, so they alone can be turned
+# off (AUDIT_TOOL_USE=false) or sampled (AUDIT_TOOL_USE_SAMPLE, a fraction in
+# [0, 1]); both are read through get_config(). Skipped calls are never
+# sanitized or serialized. Lifecycle and CI/CD events are always logged.
 
 
 async def log_tool_use(
     tool_name: str,
     tool_input: dict,
     tool_result: Any,
-    context: dict
+    context: AuditContext | Mapping[str, Any]
 ) -> None:
     """
     Log tool usage for audit trail.
 
     This hook is called after each tool execution to maintain
-    a complete record of agent actions.
+    a complete record of agent actions, unless tool-use logging is
+    disabled or sampled via AUDIT_TOOL_USE / AUDIT_TOOL_USE_SAMPLE.
+    ``tool_input`` is never mutated; a shallow copy is taken when its
+    content is replaced.
     """
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "agent": context.get("agent_name", "unknown"),
-        "task_id": context.get("task_id"),
-        "tool": tool_name,
-        "input": _sanitize_for_log(tool_input),
-        "success": not isinstance(tool_result, Exception),
-    }
+    config = get_config()
+    sample = config.audit_tool_use_sample
+    if not config.audit_tool_use or (sample < 1.0 and random.random() >= sample):
+        return
+
+    # Don't log full file contents to avoid huge logs. Swap the content
+    # for its size before sanitizing so the body is never walked or copied.
+    if tool_name in ("Read", "Write", "Edit") and "content" in tool_input:
+        tool_input = {**tool_input, "content": f"<{len(tool_input['content'])} chars>"}
+
+    context = _as_context(context)
+    agent = context.agent_name
+    task_id = context.task_id
+    values = (
+        _now_iso(),
+        agent,
+        task_id,
+        tool_name,
+        _sanitize_for_log(tool_input),
+        not isinstance(tool_result, Exception),
+    )
 
-    # Don't log full file contents to avoid huge logs
-    if tool_name in ("Read", "Write", "Edit"):
-        if "content" in log_entry["input"]:
-            content = log_entry["input"]["content"]
-            log_entry["input"]["content"] = f"<{len(content)} chars>"
+    await _submit(context, _encode_tool_use, values, task_id, agent)
 
-    log_file = Path(context.get("store_path", "./context_store")) / "audit.jsonl"
-    log_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(log_file, "a") as f:
-        f.write(json.dumps(log_entry) + "\n")
+_encode_agent_start = _EventEncoder("agent_start", "agent", "task_id", "task_summary")
 
 
 async def log_agent_start(
     agent_name: str,
     task: str,
-    context: dict
+    context: AuditContext | Mapping[str, Any]
 ) -> None:
     """Log when an agent starts a task."""
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "event": "agent_start",
-        "agent": agent_name,
-        "task_id": context.get("task_id"),
-        "task_summary": task[:200] + "..." if len(task) > 200 else task,
-    }
+    context = _as_context(context)
+    task_id = context.task_id
+    values = (
+        _now_iso(),
+        agent_name,
+        task_id,
+        task[:200] + "..." if len(task) > 200 else task,
+    )
+
+    await _submit(context, _encode_agent_start, values, task_id, agent_name)
 
-    log_file = Path(context.get("store_path", "./context_store")) / "audit.jsonl"
-    log_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(log_file, "a") as f:
-        f.write(json.dumps(log_entry) + "\n")
+_encode_agent_complete = _EventEncoder("agent_complete", "agent", "task_id", "result_summary")
 
 
 async def log_agent_complete(
     agent_name: str,
     result: str,
-    context: dict
+    context: AuditContext | Mapping[str, Any]
 ) -> None:
     """Log when an agent completes a task."""
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "event": "agent_complete",
-        "agent": agent_name,
-        "task_id": context.get("task_id"),
-        "result_summary": result[:200] + "..." if len(result) > 200 else result,
-    }
+    context = _as_context(context)
+    task_id = context.task_id
+    values = (
+        _now_iso(),
+        agent_name,
+        task_id,
+        result[:200] + "..." if len(result) > 200 else result,
+    )
+
+    await _submit(context, _encode_agent_complete, values, task_id, agent_name)
+
 
-    log_file = Path(context.get("store_path", "./context_store")) / "audit.jsonl"
-    log_file.parent.mkdir(parents=True, exist_ok=True)
+def audit_timestamp() -> str:
+    """Current time, formatted like audit entry timestamps."""
+    return _now_iso()
 
-    with open(log_file, "a") as f:
-        f.write(json.dumps(log_entry) + "\n")
+
+_SENSITIVE_KEY = re.compile(r"password|secret|token|key|credential|auth", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def _is_sensitive(key: str) -> bool:
+    """Whether a dict key names a value that must not be logged."""
+    return _SENSITIVE_KEY.search(key) is not None
 
 
 def _sanitize_for_log(data: Any) -> Any:
     """Remove sensitive data from log entries."""
-    if isinstance(data, dict):
-        sanitized = {}
-        sensitive_keys = {"password", "secret", "token", "key", "credential", "auth"}
+    if not isinstance(data, (dict, list)):
+        return data
 
-        for k, v in data.items():
-            if any(s in k.lower() for s in sensitive_keys):
-                sanitized[k] = "<redacted>"
+    # Walk nested containers with an explicit stack instead of recursing,
+    # copying each one into its sanitized counterpart as we go
+    root = {} if isinstance(data, dict) else [None] * len(data)
+    stack = [(data, root)]
+
+    while stack:
+        source, target = stack.pop()
+        is_dict = isinstance(source, dict)
+        items = source.items() if is_dict else enumerate(source)
+
+        for k, v in items:
+            if is_dict and _is_sensitive(k):
+                target[k] = "<redacted>"
+            elif isinstance(v, dict):
+                target[k] = child = {}
+                stack.append((v, child))
+            elif isinstance(v, list):
+                target[k] = child = [None] * len(v)
+                stack.append((v, child))
             else:
-                sanitized[k] = _sanitize_for_log(v)
-        return sanitized
-    elif isinstance(data, list):
-        return [_sanitize_for_log(item) for item in data]
-    else:
-        return data
+                target[k] = v
+
+    return root
 
 
 def get_audit_hooks() -> dict[str, list[Callable]]:
@@ -116,12 +551,17 @@ def get_audit_hooks() -> dict[str, list[Callable]]:
 
 # CI/CD specific audit events
 
+_encode_build_trigger = _EventEncoder(
+    "build_trigger", "job_name", "build_number", "triggered_by", "pipeline_id", "task_id"
+)
+
+
 async def log_build_trigger(
     job_name: str,
     build_number: int,
     triggered_by: str,
     pipeline_id: str,
-    context: dict
+    context: AuditContext | Mapping[str, Any]
 ) -> None:
     """
     Log when a Jenkins build is triggered.
@@ -131,23 +571,26 @@ async def log_build_trigger(
         build_number: Build number
         triggered_by: Agent or user that triggered the build
         pipeline_id: Pipeline ID for correlation
-        context: Additional context
+        context: Audit context (agent, task, store), or the equivalent dict
     """
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "event": "build_trigger",
-        "job_name": job_name,
-        "build_number": build_number,
-        "triggered_by": triggered_by,
-        "pipeline_id": pipeline_id,
-        "task_id": context.get("task_id"),
-    }
+    context = _as_context(context)
+    task_id = context.task_id
+    values = (
+        _now_iso(),
+        job_name,
+        build_number,
+        triggered_by,
+        pipeline_id,
+        task_id,
+    )
+
+    await _submit(context, _encode_build_trigger, values, task_id)
 
-    log_file = Path(context.get("store_path", "./context_store")) / "audit.jsonl"
-    log_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(log_file, "a") as f:
-        f.write(json.dumps(log_entry) + "\n")
+_encode_artifact_upload = _EventEncoder(
+    "artifact_upload", "artifact_path", "repository", "version", "sha256",
+    "uploaded_by", "pipeline_id", "task_id"
+)
 
 
 async def log_artifact_upload(
@@ -157,7 +600,7 @@ async def log_artifact_upload(
     sha256: str,
     uploaded_by: str,
     pipeline_id: str,
-    context: dict
+    context: AuditContext | Mapping[str, Any]
 ) -> None:
     """
     Log when an artifact is uploaded to Artifactory.
@@ -169,25 +612,28 @@ async def log_artifact_upload(
         sha256: SHA-256 checksum (critical for compliance)
         uploaded_by: Agent or user that uploaded
         pipeline_id: Pipeline ID for correlation
-        context: Additional context
+        context: Audit context (agent, task, store), or the equivalent dict
     """
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "event": "artifact_upload",
-        "artifact_path": artifact_path,
-        "repository": repository,
-        "version": version,
-        "sha256": sha256,
-        "uploaded_by": uploaded_by,
-        "pipeline_id": pipeline_id,
-        "task_id": context.get("task_id"),
-    }
+    context = _as_context(context)
+    task_id = context.task_id
+    values = (
+        _now_iso(),
+        artifact_path,
+        repository,
+        version,
+        sha256,
+        uploaded_by,
+        pipeline_id,
+        task_id,
+    )
+
+    await _submit(context, _encode_artifact_upload, values, task_id)
 
-    log_file = Path(context.get("store_path", "./context_store")) / "audit.jsonl"
-    log_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(log_file, "a") as f:
-        f.write(json.dumps(log_entry) + "\n")
+_encode_deployment = _EventEncoder(
+    "deployment", "environment", "artifact_version", "deployed_by", "approved_by",
+    "approval_count", "pipeline_id", "status", "task_id"
+)
 
 
 async def log_deployment(
@@ -197,7 +643,7 @@ async def log_deployment(
     approved_by: list[str],
     pipeline_id: str,
     status: str,
-    context: dict
+    context: AuditContext | Mapping[str, Any]
 ) -> None:
     """
     Log deployment events with full approval chain.
@@ -209,26 +655,29 @@ async def log_deployment(
         approved_by: List of approvers
         pipeline_id: Pipeline ID for correlation
         status: Deployment status (success, failed)
-        context: Additional context
+        context: Audit context (agent, task, store), or the equivalent dict
     """
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "event": "deployment",
-        "environment": environment,
-        "artifact_version": artifact_version,
-        "deployed_by": deployed_by,
-        "approved_by": approved_by,
-        "approval_count": len(approved_by),
-        "pipeline_id": pipeline_id,
-        "status": status,
-        "task_id": context.get("task_id"),
-    }
+    context = _as_context(context)
+    task_id = context.task_id
+    values = (
+        _now_iso(),
+        environment,
+        artifact_version,
+        deployed_by,
+        approved_by,
+        len(approved_by),
+        pipeline_id,
+        status,
+        task_id,
+    )
+
+    await _submit(context, _encode_deployment, values, task_id)
 
-    log_file = Path(context.get("store_path", "./context_store")) / "audit.jsonl"
-    log_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(log_file, "a") as f:
-        f.write(json.dumps(log_entry) + "\n")
+_encode_rollback = _EventEncoder(
+    "rollback", "environment", "from_version", "to_version", "reason",
+    "initiated_by", "approved_by", "task_id"
+)
 
 
 async def log_rollback(
@@ -238,7 +687,7 @@ async def log_rollback(
     reason: str,
     initiated_by: str,
     approved_by: str,
-    context: dict
+    context: AuditContext | Mapping[str, Any]
 ) -> None:
     """
     Log rollback events.
@@ -250,25 +699,22 @@ async def log_rollback(
         reason: Reason for rollback
         initiated_by: Agent or user that initiated rollback
         approved_by: Approver for the rollback
-        context: Additional context
+        context: Audit context (agent, task, store), or the equivalent dict
     """
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "event": "rollback",
-        "environment": environment,
-        "from_version": from_version,
-        "to_version": to_version,
-        "reason": reason,
-        "initiated_by": initiated_by,
-        "approved_by": approved_by,
-        "task_id": context.get("task_id"),
-    }
-
-    log_file = Path(context.get("store_path", "./context_store")) / "audit.jsonl"
-    log_file.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(log_file, "a") as f:
-        f.write(json.dumps(log_entry) + "\n")
+    context = _as_context(context)
+    task_id = context.task_id
+    values = (
+        _now_iso(),
+        environment,
+        from_version,
+        to_version,
+        reason,
+        initiated_by,
+        approved_by,
+        task_id,
+    )
+
+    await _submit(context, _encode_rollback, values, task_id)
 
 
 def read_audit_log(
@@ -288,30 +734,173 @@ def read_audit_log(
 
     Returns:
         List of audit log entries (most recent first)
+
+    Note:
+        Entries still queued by the background writer are not visible yet;
+        await flush_audit_log() first when reading back from the same loop.
     """
+    if store_path in _SINKS:
+        return _read_memory(task_id, agent, limit)
+
     log_file = Path(store_path) / "audit.jsonl"
 
     if not log_file.exists():
         return []
 
+    # Filtered reads only parse the lines the sidecar index points at
+    if task_id or agent:
+        entries = _read_indexed(log_file, task_id, agent, limit)
+        if entries is not None:
+            return entries
+
+    # Without a limit every line is needed anyway, so parse in one pass
+    if not limit:
+        return _read_all(log_file, task_id, agent)
+
+    # Walk the file from the end so a small limit only touches the tail
     entries = []
-    with open(log_file, "r") as f:
-        for line in f:
-            if line.strip():
-                entry = json.loads(line)
+    for line in _iter_lines_reversed(log_file):
+        if not line.strip():
+            continue
+        entry = _loads(line)
 
-                # Apply filters
-                if task_id and entry.get("task_id") != task_id:
-                    continue
-                if agent and entry.get("agent") != agent:
-                    continue
+        # Apply filters
+        if task_id and entry.get("task_id") != task_id:
+            continue
+        if agent and entry.get("agent") != agent:
+            continue
 
-                entries.append(entry)
+        entries.append(entry)
+        if limit and len(entries) >= limit:
+            break
 
-    # Most recent first
-    entries.reverse()
+    return entries
 
-    if limit:
-        entries = entries[:limit]
+
+def _read_memory(
+    task_id: str | None,
+    agent: str | None,
+    limit: int | None
+) -> list[dict]:
+    """Filter the in-memory log, most recent first, without any JSON round-trip."""
+    entries = []
+    for entry in reversed(_MEMORY_LOG):
+        if task_id and entry.get("task_id") != task_id:
+            continue
+        if agent and entry.get("agent") != agent:
+            continue
+
+        entries.append(entry)
+        if limit and len(entries) >= limit:
+            break
 
     return entries
+
+
+def _read_indexed(
+    log_file: Path,
+    task_id: str | None,
+    agent: str | None,
+    limit: int | None
+) -> list[dict] | None:
+    """
+    Answer a filtered read from the audit.idx sidecar.
+
+    Returns None when the index is missing or does not account for every
+    byte of the log (e.g. a log from before the index existed, until the
+    next write backfills it), in which case the caller falls back to
+    scanning the log itself.
+    """
+    try:
+        data = log_file.with_suffix(".idx").read_bytes()
+    except FileNotFoundError:
+        return None
+
+    task_hash = _key_hash(task_id, 8)
+    agent_hash = _key_hash(agent, 4)
+
+    covered = 0
+    matches = []
+    usable = len(data) - len(data) % _IDX_RECORD.size
+    for rec_task, rec_agent, offset, length in _IDX_RECORD.iter_unpack(data[:usable]):
+        covered += length
+        if (not task_id or rec_task == task_hash) and (not agent or rec_agent == agent_hash):
+            matches.append((offset, length))
+
+    if covered != log_file.stat().st_size:
+        return None
+
+    entries = []
+    fd = os.open(log_file, os.O_RDONLY | _O_BINARY)
+    try:
+        for offset, length in reversed(matches):
+            os.lseek(fd, offset, os.SEEK_SET)
+            entry = _loads(os.read(fd, length))
+
+            # Re-check the real values - hashes can collide
+            if task_id and entry.get("task_id") != task_id:
+                continue
+            if agent and entry.get("agent") != agent:
+                continue
+
+            entries.append(entry)
+            if limit and len(entries) >= limit:
+                break
+    except ValueError:
+        # Offsets that do not land on a JSON line - don't trust the index
+        return None
+    finally:
+        os.close(fd)
+
+    return entries
+
+
+def _read_all(
+    log_file: Path,
+    task_id: str | None,
+    agent: str | None
+) -> list[dict]:
+    """
+    Read the whole log in one call and parse it in a single comprehension.
+
+    Filter values that serialize verbatim are first matched as quoted byte
+    substrings, so lines that cannot match are dropped without being parsed.
+    """
+    lines = log_file.read_bytes().split(b"\n")
+
+    needles = [_json_needle(value) for value in (task_id, agent) if value]
+    needles = [needle for needle in needles if needle]
+    if needles:
+        lines = [line for line in lines if all(needle in line for needle in needles)]
+
+    entries = [_loads(line) for line in reversed(lines) if line.strip()]
+
+    if task_id:
+        entries = [entry for entry in entries if entry.get("task_id") == task_id]
+    if agent:
+        entries = [entry for entry in entries if entry.get("agent") == agent]
+
+    return entries
+
+
+def _json_needle(value: str) -> bytes | None:
+    """The quoted JSON form of a value, or None if encoders may escape it."""
+    if not value.isascii() or not value.isprintable() or '"' in value or "\\" in value:
+        return None
+    return b'"' + value.encode() + b'"'
+
+
+def _iter_lines_reversed(path: Path) -> Iterator[bytes]:
+    """Yield the lines of a file from last to first, straight from a memory map."""
+    with open(path, "rb") as f:
+        # mmap rejects empty files
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Only the pages holding the lines actually consumed are read in;
+            # each line is copied out once, with no block/fragment joins
+            end = len(mm)
+            while end >= 0:
+                start = mm.rfind(b"\n", 0, end) + 1
+                yield mm[start:end]
+                end = start - 1
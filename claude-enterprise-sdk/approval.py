@@ -1,13 +1,43 @@
 """Human-in-the-loop approval mechanism."""
 from __future__ import annotations
 
+import asyncio
 import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from dataclasses import dataclass, asdict
-from typing import Optional
+from secrets import token_hex
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows - writers are not serialized
+    fcntl = None
+
+
+if orjson is not None:
+    def _dumps_line(record: dict) -> bytes:
+        """Serialize a record to a newline-terminated JSON line."""
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+
+    _loads = orjson.loads
+else:
+    def _dumps_line(record: dict) -> bytes:
+        """Serialize a record to a newline-terminated JSON line."""
+        return json.dumps(record).encode() + b"\n"
+
+    _loads = json.loads
+
 
 class ApprovalStatus(Enum):
     """Status of an approval request."""
@@ -17,7 +47,13 @@ class ApprovalStatus(Enum):
     TIMED_OUT = "timed_out"
 
 
-@dataclass
+# Status values as stored on disk, mapped straight to their members -
+# a dict lookup is cheaper than ApprovalStatus(value)
+_STATUS_MAP = {status.value: status for status in ApprovalStatus}
+_PENDING = ApprovalStatus.PENDING.value
+
+
+@dataclass(**({"slots": True} if sys.version_info >= (3, 10) else {}))
 class ApprovalRequest:
     """A request for human approval."""
     request_id: str
@@ -32,14 +68,24 @@ class ApprovalRequest:
     comments: Optional[str] = None
 
     def to_dict(self) -> dict:
-        data = asdict(self)
-        data["status"] = self.status.value
-        return data
+        # Built by hand rather than with asdict() so details is not deep-copied
+        return {
+            "request_id": self.request_id,
+            "agent": self.agent,
+            "action": self.action,
+            "description": self.description,
+            "details": self.details,
+            "timestamp": self.timestamp,
+            "status": self.status.value,
+            "approver": self.approver,
+            "approval_timestamp": self.approval_timestamp,
+            "comments": self.comments,
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "ApprovalRequest":
-        data["status"] = ApprovalStatus(data["status"])
-        return cls(**data)
+        status = _STATUS_MAP.get(data["status"]) or ApprovalStatus(data["status"])
+        return cls(**{**data, "status": status})
 
 
 class ApprovalGate:
@@ -53,7 +99,29 @@ class ApprovalGate:
     def __init__(self, store_path: str = "./context_store"):
         self.store_path = Path(store_path)
         self.store_path.mkdir(parents=True, exist_ok=True)
-        self.approvals_file = self.store_path / "approvals.json"
+        # Append-only log: one full record per request, followed by status
+        # deltas; rewritten ("compacted") once it grows past twice the
+        # number of live requests
+        self.approvals_file = self.store_path / "approvals.jsonl"
+        self._legacy_file = self.store_path / "approvals.json"
+        # Held while appending or compacting, so concurrent gates (and
+        # processes) never lose each other's updates
+        self._lock_file = self.store_path / "approvals.lock"
+        self._lock_depth = 0
+
+        # Folded view of the log and how much of the file it covers
+        self._approvals: dict[str, dict] = {}
+        # IDs of pending requests, in creation order (dict as an ordered set)
+        self._pending_ids: dict[str, None] = {}
+        # ApprovalRequest objects already built from the folded records
+        self._objects: dict[str, ApprovalRequest] = {}
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._records = 0
+
+        # Nesting depth of batch() and the records it has yet to append
+        self._batch_depth = 0
+        self._pending: list[dict] = []
 
     def request_approval(
         self,
@@ -74,10 +142,8 @@ class ApprovalGate:
         Returns:
             ApprovalRequest object
         """
-        import uuid
-
         request = ApprovalRequest(
-            request_id=f"approval-{uuid.uuid4().hex[:8]}",
+            request_id=f"approval-{token_hex(4)}",
             agent=agent,
             action=action,
             description=description,
@@ -90,12 +156,8 @@ class ApprovalGate:
 
     def get_pending_approvals(self) -> list[ApprovalRequest]:
         """Get all pending approval requests."""
-        approvals = self._load_approvals()
-        return [
-            ApprovalRequest.from_dict(a)
-            for a in approvals.values()
-            if a["status"] == ApprovalStatus.PENDING.value
-        ]
+        self._load_approvals()
+        return [self._get_object(rid) for rid in self._pending_ids]
 
     def approve(
         self,
@@ -147,11 +209,28 @@ class ApprovalGate:
 
     def check_status(self, request_id: str) -> Optional[ApprovalRequest]:
         """Check the status of an approval request."""
-        approvals = self._load_approvals()
-        if request_id in approvals:
-            return ApprovalRequest.from_dict(approvals[request_id])
+        if request_id in self._load_approvals():
+            return self._get_object(request_id)
         return None
 
+    @contextmanager
+    def batch(self) -> Iterator["ApprovalGate"]:
+        """
+        Group several changes into a single append to the approvals log.
+
+        Inside the block changes are kept in memory only; they are written
+        once when the outermost batch exits, even on error, so a rejection
+        that raises is still persisted.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending:
+                pending, self._pending = self._pending, []
+                self._write_records(pending)
+
     def _update_status(
         self,
         request_id: str,
@@ -165,29 +244,258 @@ class ApprovalGate:
         if request_id not in approvals:
             raise ValueError(f"Approval request not found: {request_id}")
 
-        approvals[request_id]["status"] = status.value
-        approvals[request_id]["approver"] = approver
-        approvals[request_id]["approval_timestamp"] = datetime.now().isoformat()
-        approvals[request_id]["comments"] = comments
+        # A repeated approve/reject (e.g. a retry) changes nothing worth writing
+        record = approvals[request_id]
+        if (
+            record["status"] == status.value
+            and record["approver"] == approver
+            and record["comments"] == comments
+        ):
+            return self._get_object(request_id)
+
+        delta = {
+            "request_id": request_id,
+            "status": status.value,
+            "approver": approver,
+            "approval_timestamp": datetime.now().isoformat(),
+            "comments": comments,
+        }
+        approvals[request_id].update(delta)
+        self._track_pending(request_id, delta["status"])
+
+        request = self._objects.get(request_id)
+        if request is None:
+            request = self._get_object(request_id)
+        else:
+            request.status = status
+            request.approver = approver
+            request.approval_timestamp = delta["approval_timestamp"]
+            request.comments = comments
 
-        self._save_approvals(approvals)
-        return ApprovalRequest.from_dict(approvals[request_id])
+        self._append(delta)
+        return request
 
     def _save_request(self, request: ApprovalRequest) -> None:
         """Save a new approval request."""
-        approvals = self._load_approvals()
-        approvals[request.request_id] = request.to_dict()
-        self._save_approvals(approvals)
+        record = request.to_dict()
+        self._load_approvals()[request.request_id] = dict(record)
+        self._objects[request.request_id] = request
+        self._track_pending(request.request_id, record["status"])
+        self._append(record)
 
     def _load_approvals(self) -> dict:
-        """Load all approvals."""
+        """Load all approvals, folding in only what was appended since the last read."""
+        if self._pending:
+            # Unwritten batch changes are newer than the file
+            return self._approvals
+
+        try:
+            st = os.stat(self.approvals_file)
+        except FileNotFoundError:
+            with self._locked():
+                self._migrate_legacy()
+            try:
+                st = os.stat(self.approvals_file)
+            except FileNotFoundError:
+                self._reset()
+                return self._approvals
+
+        if st.st_ino != self._inode or st.st_size < self._offset:
+            # Compacted by another gate, or cleared - start over
+            self._reset(st.st_ino)
+
+        if st.st_size > self._offset:
+            with open(self.approvals_file, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+            # Leave a partially written last line for the next read
+            end = data.rfind(b"\n") + 1
+            self._fold(data[:end])
+            self._offset += end
+
+        return self._approvals
+
+    def _reset(self, inode: Optional[int] = None) -> None:
+        """Forget the folded log state."""
+        self._approvals = {}
+        self._pending_ids = {}
+        self._objects = {}
+        self._inode = inode
+        self._offset = 0
+        self._records = 0
+
+    def _fold(self, data: bytes) -> None:
+        """Apply log lines (full records or status deltas) to the folded view."""
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            record = _loads(line)
+            self._records += 1
+
+            request_id = record["request_id"]
+            current = self._approvals.get(request_id)
+            if current is None:
+                self._approvals[request_id] = current = record
+            else:
+                current.update(record)
+                # Changed by another gate - rebuild the object on next access
+                self._objects.pop(request_id, None)
+            self._track_pending(request_id, current["status"])
+
+    def _get_object(self, request_id: str) -> ApprovalRequest:
+        """Get the ApprovalRequest for a loaded record, building it once."""
+        request = self._objects.get(request_id)
+        if request is None:
+            request = self._objects[request_id] = ApprovalRequest.from_dict(self._approvals[request_id])
+        return request
+
+    def _track_pending(self, request_id: str, status: str) -> None:
+        """Keep the pending index in step with a request's status."""
+        if status == _PENDING:
+            self._pending_ids[request_id] = None
+        else:
+            self._pending_ids.pop(request_id, None)
+
+    def _append(self, record: dict) -> None:
+        """Append a record to the log (deferred while a batch is open)."""
+        if self._batch_depth:
+            self._pending.append(record)
+            return
+        self._write_records([record])
+
+    def _write_records(self, records: list[dict]) -> None:
+        """Append records to the log, compacting it once it has grown enough."""
+        data = b"".join(map(_dumps_line, records))
+        with self._locked():
+            with open(self.approvals_file, "ab") as f:
+                f.write(data)
+                f.flush()
+                end = f.tell()
+                inode = os.fstat(f.fileno()).st_ino
+
+            # Only skip over our own lines if nothing else was appended since
+            # the last read; otherwise the next load re-reads from the old offset
+            if end - len(data) == self._offset and self._inode in (None, inode):
+                self._inode = inode
+                self._offset = end
+                self._records += len(records)
+
+            if self._records > 2 * len(self._approvals):
+                # Fold in anything other writers appended before rewriting
+                self._load_approvals()
+                self._compact()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the cross-process lock on the approvals log (reentrant)."""
+        fd = None
+        if fcntl is not None and not self._lock_depth:
+            fd = os.open(self._lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+
+        self._lock_depth += 1
+        try:
+            if fd is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            self._lock_depth -= 1
+            if fd is not None:
+                # Closing the descriptor releases the lock
+                os.close(fd)
+
+    def _compact(self) -> None:
+        """Atomically rewrite the log with a single full record per request."""
+        data = b"".join(map(_dumps_line, self._approvals.values()))
+        tmp_file = self.approvals_file.with_suffix(".jsonl.tmp")
+
+        # Make the new contents durable before they replace the old log, so
+        # a crash leaves either the old or the new file - never a partial one
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, self.approvals_file)
+
+        self._inode = os.stat(self.approvals_file).st_ino
+        self._offset = len(data)
+        self._records = len(self._approvals)
+
+    def _migrate_legacy(self) -> bool:
+        """Convert an approvals.json from before the log format, if there is one."""
         if self.approvals_file.exists():
-            return json.loads(self.approvals_file.read_text())
-        return {}
+            # Already migrated by another gate
+            return False
+
+        try:
+            approvals = _loads(self._legacy_file.read_bytes())
+        except FileNotFoundError:
+            return False
+
+        self._approvals = approvals
+        self._objects = {}
+        self._pending_ids = {}
+        for request_id, record in approvals.items():
+            self._track_pending(request_id, record["status"])
+        self._compact()
+        self._legacy_file.unlink()
+        return True
+
+
+# Accepted answers at the approval prompt, normalized to one action each
+_RESPONSES = {
+    "y": "yes",
+    "yes": "yes",
+    "n": "no",
+    "no": "no",
+    "d": "details",
+    "details": "details",
+}
+
+
+async def _read_console(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a blocking console read in a thread and await its result.
+
+    On a terminal the read runs in a daemon thread, so unlike
+    asyncio.to_thread a prompt still waiting when the caller is cancelled
+    (Ctrl-C) does not hold up shutdown. Reads from a pipe or file hold the
+    buffered stdin lock, which a daemon thread would still own at interpreter
+    shutdown (a fatal error), so those use asyncio.to_thread; they end at
+    EOF anyway.
+    """
+    if sys.stdin is None or not sys.stdin.isatty():
+        return await asyncio.to_thread(func, *args)
 
-    def _save_approvals(self, approvals: dict) -> None:
-        """Save all approvals."""
-        self.approvals_file.write_text(json.dumps(approvals, indent=2))
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(outcome: Callable[[Any], None], value: Any) -> None:
+        if not future.done():
+            outcome(value)
+
+    def read() -> None:
+        try:
+            value = func(*args)
+        except BaseException as e:
+            outcome, value = future.set_exception, e
+        else:
+            outcome = future.set_result
+        try:
+            loop.call_soon_threadsafe(settle, outcome, value)
+        except RuntimeError:
+            pass  # The event loop is already closed
+
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+
+async def ainput(prompt: str = "") -> str:
+    """input() that does not block the event loop (see _read_console)."""
+    return await _read_console(input, prompt)
 
 
 def prompt_for_approval(request: ApprovalRequest) -> tuple[bool, str]:
@@ -200,44 +508,70 @@ def prompt_for_approval(request: ApprovalRequest) -> tuple[bool, str]:
     Returns:
         Tuple of (approved: bool, comments: str)
     """
-    print("\n" + "=" * 60)
-    print("APPROVAL REQUIRED")
-    print("=" * 60)
-    print(f"\nAgent: {request.agent}")
-    print(f"Action: {request.action}")
-    print(f"Description: {request.description}")
+    lines = [
+        "",
+        "=" * 60,
+        "APPROVAL REQUIRED",
+        "=" * 60,
+        "",
+        f"Agent: {request.agent}",
+        f"Action: {request.action}",
+        f"Description: {request.description}",
+    ]
 
     if request.details:
-        print("\nDetails:")
+        lines += ["", "Details:"]
         for key, value in request.details.items():
             if isinstance(value, list):
-                print(f"  {key}:")
-                for item in value:
-                    print(f"    - {item}")
+                lines.append(f"  {key}:")
+                lines += [f"    - {item}" for item in value]
             else:
-                print(f"  {key}: {value}")
+                lines.append(f"  {key}: {value}")
+
+    lines += ["", "-" * 60, ""]
+    # One write for the whole summary rather than a print() per line
+    sys.stdout.write("\n".join(lines))
 
-    print("\n" + "-" * 60)
+    # Serialized on the first "details" request only, then reused
+    details_json = None
 
     while True:
-        response = input("\nApprove? [y/n/details]: ").strip().lower()
+        response = _RESPONSES.get(input("\nApprove? [y/n/details]: ").strip().lower())
 
-        if response in ("y", "yes"):
+        if response == "yes":
             comments = input("Comments (optional): ").strip()
             return True, comments
 
-        elif response in ("n", "no"):
+        elif response == "no":
             comments = input("Reason for rejection: ").strip()
             return False, comments
 
-        elif response in ("d", "details"):
+        elif response == "details":
+            if details_json is None:
+                details_json = json.dumps(request.details, indent=2)
             print("\nFull details:")
-            print(json.dumps(request.details, indent=2))
+            print(details_json)
 
         else:
             print("Please enter 'y' to approve, 'n' to reject, or 'd' for details")
 
 
+async def aprompt_for_approval(request: ApprovalRequest) -> tuple[bool, str]:
+    """
+    Prompt for approval without blocking the event loop.
+
+    Runs prompt_for_approval in a worker thread, so other coroutines keep
+    running while waiting on the user.
+
+    Args:
+        request: The approval request
+
+    Returns:
+        Tuple of (approved: bool, comments: str)
+    """
+    return await _read_console(prompt_for_approval, request)
+
+
 async def require_approval(
     gate: ApprovalGate,
     agent: str,
@@ -263,10 +597,12 @@ async def require_approval(
     Raises:
         PermissionError: If approval is rejected
     """
+    # Appended right away, so the pending request is visible to other
+    # approvers (and survives a crash) while the human decides
     request = gate.request_approval(agent, action, description, details)
 
     if auto_prompt:
-        approved, comments = prompt_for_approval(request)
+        approved, comments = await aprompt_for_approval(request)
 
         if approved:
             request = gate.approve(request.request_id, "user", comments)
@@ -313,7 +649,8 @@ async def require_dual_approval(
     print("This action requires approval from TWO different approvers.")
     print("=" * 60 + "\n")
 
-    # First approval
+    # Pending requests are appended as soon as they are created; batch()
+    # only groups writes that happen between two prompts
     print("[Approval 1 of 2]")
     request1 = gate.request_approval(
         agent,
@@ -321,49 +658,57 @@ async def require_dual_approval(
         f"[Primary] {description}",
         details
     )
-    approved1, comments1 = prompt_for_approval(request1)
+    approved1, comments1 = await aprompt_for_approval(request1)
 
     if not approved1:
         request1 = gate.reject(request1.request_id, "user", comments1)
         raise PermissionError(f"First approval rejected: {comments1}")
 
-    request1 = gate.approve(request1.request_id, "user", comments1)
-    first_approver = request1.approver
-    print(f"\n First approval granted by: {first_approver}\n")
+    with gate.batch():
+        # The first approval and the second request share one append
+        request1 = gate.approve(request1.request_id, "user", comments1)
+        first_approver = request1.approver
+        print(f"\n First approval granted by: {first_approver}\n")
+
+        # Second approval (must be different person)
+        print("[Approval 2 of 2]")
+        print(f"Note: Must be different from first approver ({first_approver})")
 
-    # Second approval (must be different person)
-    print("[Approval 2 of 2]")
-    print(f"Note: Must be different from first approver ({first_approver})")
+        details_with_context = details.copy() if details else {}
+        details_with_context["first_approver"] = first_approver
+        details_with_context["requires_different_approver"] = True
 
-    details_with_context = details.copy() if details else {}
-    details_with_context["first_approver"] = first_approver
-    details_with_context["requires_different_approver"] = True
+        def request_second() -> ApprovalRequest:
+            return gate.request_approval(
+                agent,
+                f"{action}_secondary",
+                f"[Secondary] {description}",
+                details_with_context
+            )
+
+        request2 = request_second()
 
     while True:
-        request2 = gate.request_approval(
-            agent,
-            f"{action}_secondary",
-            f"[Secondary] {description}",
-            details_with_context
-        )
-        approved2, comments2 = prompt_for_approval(request2)
+        approved2, comments2 = await aprompt_for_approval(request2)
 
         if not approved2:
             request2 = gate.reject(request2.request_id, "user", comments2)
             raise PermissionError(f"Second approval rejected: {comments2}")
 
         # For CLI, we need to ask who the second approver is
-        second_approver = input("Enter your username/email: ").strip()
+        second_approver = (await ainput("Enter your username/email: ")).strip()
 
         if second_approver == first_approver:
             print(f"\n Error: Second approver must be different from {first_approver}")
             print("Please have a different person approve.\n")
+            request2 = request_second()
             continue
 
         # Check against authorized approvers if provided
         if authorized_approvers and second_approver not in authorized_approvers:
             print(f"\n Error: {second_approver} is not an authorized approver")
             print(f"Authorized approvers: {', '.join(authorized_approvers)}\n")
+            request2 = request_second()
             continue
 
         request2 = gate.approve(request2.request_id, second_approver, comments2)
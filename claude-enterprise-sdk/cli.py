@@ -23,15 +23,93 @@ Usage:
 
 import asyncio
 import argparse
-import re
+import importlib
+import os
 import sys
-from pathlib import Path
 
-from agents.dev_agent import DevAgent
-from agents.test_agent import TestAgent
-from agents.cyber_agent import CyberAgent
-from agents.cicd_agent import CICDAgent, Environment
-from pipeline import DevTestPipeline, FullCICDPipeline
+from approval import ainput
+
+# Agents and pipelines are imported inside the functions that use them, so
+# --help and argument errors return without loading any agent code
+
+# Agents by @mention name: (module, class)
+_AGENTS = {
+    "dev": ("agents.dev_agent", "DevAgent"),
+    "test": ("agents.test_agent", "TestAgent"),
+    "cyber": ("agents.cyber_agent", "CyberAgent"),
+    "cicd": ("agents.cicd_agent", "CICDAgent"),
+}
+
+# One-shot tasks for the non-dev agents: (banner title, method, task keyword)
+_ONE_SHOT_TASKS = {
+    "test": ("TEST AGENT", "explore_and_test", "description"),
+    "cyber": ("CYBER AGENT", "full_scan", "description"),
+    "cicd": ("CI/CD AGENT", "run", "task"),
+}
+
+# DevAgent methods by --type; other types run as custom_task
+_DEV_METHODS = {
+    "feature": "implement_feature",
+    "bugfix": "fix_bug",
+    "refactor": "refactor",
+    "review": "review_code",
+    "explore": "explore",
+}
+
+
+# Banner rule for task headers and result summaries
+_BAR = "=" * 60
+
+
+# Environments deployed for each --deploy choice
+_DEPLOY_TARGETS = {
+    "all": ("dev", "staging", "prod"),
+    "dev": ("dev",),
+    "staging": ("staging",),
+    "prod": ("prod",),
+}
+
+
+# Stage list printed at the start of pipeline mode
+_PIPELINE_STAGES = """Pipeline stages:
+  1. Dev Agent   - Implement the task
+  2. Dev Review  - Human approves code changes
+  3. Test Agent  - Generate tests
+  4. Test Review - Human approves tests
+"""
+
+# Extra stages listed when --deploy is given
+_CICD_STAGES = """  5. Cyber Agent - Security scan
+  6. Security Gate - BLOCK/WARN/APPROVE
+  7. Build      - Jenkins build (if configured)
+  8. Deploy     - Deploy to environments
+"""
+
+
+# Interactive-mode commands that end the session
+_EXIT_CMDS = frozenset({"exit", "quit", "q"})
+
+
+# Agent and command reference shown when interactive mode starts
+_INTERACTIVE_HELP = f"""
+Agents:  @dev (default)  @test  @cyber  @cicd
+
+Commands:
+  @test <task>     - Run task with Test Agent
+  @cyber <task>    - Run task with Cyber Agent
+  @cicd <task>     - Run task with CI/CD Agent
+  @dev <task>      - Run task with Dev Agent
+  <task>           - Run task with Dev Agent (default)
+  pipeline <task>  - Run Dev -> Test pipeline with approvals
+  resume           - Continue the last session
+  exit/quit        - Stop
+{_BAR}
+
+"""
+
+
+# Mention prefixes for parse_agent_mention, as (agent name, "@name")
+_AGENT_MENTIONS = tuple((name, f"@{name}") for name in ("dev", "test", "cyber", "cicd"))
 
 
 def parse_agent_mention(task: str) -> tuple[str, str]:
@@ -46,160 +124,85 @@ def parse_agent_mention(task: str) -> tuple[str, str]:
     Returns:
         Tuple of (agent_name, remaining_task)
     """
-    match = re.match(r"^@(dev|test|cyber|cicd)\s+", task, re.IGNORECASE)
-    if match:
-        agent = match.group(1).lower()
-        remaining = task[match.end():].strip()
-        return agent, remaining
+    for agent, prefix in _AGENT_MENTIONS:
+        end = len(prefix)
+        # The mention must be followed by whitespace, e.g. "@test write tests"
+        if task[:end].lower() == prefix and task[end:end + 1].isspace():
+            return agent, task[end:].strip()
     return "dev", task
 
 
-async def run_task(args: argparse.Namespace) -> int:
-    """Run a single agent task."""
-    agent = DevAgent(store_path=args.store)
-
-    task_methods = {
-        "feature": agent.implement_feature,
-        "bugfix": agent.fix_bug,
-        "refactor": agent.refactor,
-        "review": agent.review_code,
-        "explore": agent.explore,
-    }
-
-    print(f"\n{'='*60}")
-    print(f"Claude Enterprise SDK - {args.type.upper()} Task")
-    print(f"Working directory: {args.dir}")
-    print(f"{'='*60}\n")
-
-    if args.type in task_methods:
-        result = await task_methods[args.type](
-            description=args.task,
-            working_dir=args.dir,
-            task_id=args.task_id
-        )
-    else:
-        result = await agent.custom_task(
-            description=args.task,
-            working_dir=args.dir,
-            task_id=args.task_id,
-            resume=args.resume
-        )
-
-    # Display result
-    print(f"\n{'='*60}")
-    print(f"Task ID: {result.task_id}")
-    if result.session_id:
-        print(f"Session ID: {result.session_id}")
-    print(f"Status: {'SUCCESS' if result.success else 'FAILED'}")
-    print(f"{'='*60}\n")
-
-    if result.error:
-        print(f"Error: {result.error}\n")
-        return 1
-
-    print(result.content)
-    return 0
-
-
-async def run_test_task(args: argparse.Namespace, task: str) -> int:
-    """Run a standalone test agent task."""
-    agent = TestAgent(store_path=args.store)
+def _write_banner(title: str, working_dir: str) -> None:
+    """Write and flush a task header banner in a single stdout write."""
+    sys.stdout.write(f"\n{_BAR}\n{title}\nWorking directory: {working_dir}\n{_BAR}\n\n")
+    sys.stdout.flush()
 
-    print(f"\n{'='*60}")
-    print("Claude Enterprise SDK - TEST AGENT")
-    print(f"Working directory: {args.dir}")
-    print(f"{'='*60}\n")
 
-    result = await agent.explore_and_test(
-        description=task,
-        working_dir=args.dir,
-        task_id=args.task_id
-    )
+def _format_result_summary(result, details: str = "") -> str:
+    """Format the task ID/session/status summary block.
 
-    # Display result
-    print(f"\n{'='*60}")
-    print(f"Task ID: {result.task_id}")
-    if result.session_id:
-        print(f"Session ID: {result.session_id}")
-    print(f"Status: {'SUCCESS' if result.success else 'FAILED'}")
-    print(f"{'='*60}\n")
+    Args:
+        result: AgentResult to summarize
+        details: Extra lines (newline-terminated) placed before the closing rule
 
-    if result.error:
-        print(f"Error: {result.error}\n")
-        return 1
+    Returns:
+        The summary block, ready for a single stdout write
+    """
+    session = f"Session ID: {result.session_id}\n" if result.session_id else ""
+    status = "SUCCESS" if result.success else "FAILED"
+    return f"\n{_BAR}\nTask ID: {result.task_id}\n{session}Status: {status}\n{details}{_BAR}\n\n"
 
-    print(result.content)
-    return 0
 
+async def _run_agent(args: argparse.Namespace, agent_name: str, task: str) -> int:
+    """Run a one-shot task with the agent selected by an @mention.
 
-async def run_cyber_task(args: argparse.Namespace, task: str) -> int:
-    """Run a standalone cyber agent task."""
-    agent = CyberAgent(store_path=args.store)
+    Args:
+        args: Parsed command line arguments
+        agent_name: Agent name from parse_agent_mention
+        task: Task description with the @mention removed
 
-    print(f"\n{'='*60}")
-    print("Claude Enterprise SDK - CYBER AGENT")
-    print(f"Working directory: {args.dir}")
-    print(f"{'='*60}\n")
+    Returns:
+        Exit code
+    """
+    module_name, class_name = _AGENTS[agent_name]
+    agent = getattr(importlib.import_module(module_name), class_name)(store_path=args.store)
+
+    kwargs = {"working_dir": args.dir, "task_id": args.task_id}
+    if agent_name == "dev":
+        title = f"{args.type.upper()} Task"
+        method_name = _DEV_METHODS.get(args.type)
+        task_arg = "description"
+        if method_name is None:
+            method_name = "custom_task"
+            kwargs["resume"] = args.resume
+    else:
+        title, method_name, task_arg = _ONE_SHOT_TASKS[agent_name]
+    kwargs[task_arg] = task
 
-    result = await agent.full_scan(
-        description=task,
-        working_dir=args.dir,
-        task_id=args.task_id
-    )
+    _write_banner(f"Claude Enterprise SDK - {title}", args.dir)
 
-    # Display result
-    print(f"\n{'='*60}")
-    print(f"Task ID: {result.task_id}")
-    if result.session_id:
-        print(f"Session ID: {result.session_id}")
-    print(f"Status: {'SUCCESS' if result.success else 'FAILED'}")
+    try:
+        result = await getattr(agent, method_name)(**kwargs)
+    finally:
+        # Write the queued task context before the process exits
+        await agent.aclose()
 
-    # Parse and display security decision
-    if result.success:
+    # Display result, with the parsed security decision for cyber scans
+    details = ""
+    if agent_name == "cyber" and result.success:
         decision, blockers = agent.parse_decision(result)
-        print(f"Security Decision: {decision}")
-        if blockers:
-            for blocker in blockers:
-                print(f"  - {blocker}")
-
-    print(f"{'='*60}\n")
+        details = f"Security Decision: {decision}\n" + "".join(f"  - {blocker}\n" for blocker in blockers)
+    summary = _format_result_summary(result, details)
 
     if result.error:
-        print(f"Error: {result.error}\n")
+        sys.stdout.write(f"{summary}Error: {result.error}\n\n")
+        sys.stdout.flush()
         return 1
 
-    print(result.content)
-    return 0
-
-
-async def run_cicd_task(args: argparse.Namespace, task: str) -> int:
-    """Run a standalone CI/CD agent task."""
-    agent = CICDAgent(store_path=args.store)
-
-    print(f"\n{'='*60}")
-    print("Claude Enterprise SDK - CI/CD AGENT")
-    print(f"Working directory: {args.dir}")
-    print(f"{'='*60}\n")
-
-    result = await agent.run(
-        task=task,
-        working_dir=args.dir,
-        task_id=args.task_id
-    )
-
-    # Display result
-    print(f"\n{'='*60}")
-    print(f"Task ID: {result.task_id}")
-    if result.session_id:
-        print(f"Session ID: {result.session_id}")
-    print(f"Status: {'SUCCESS' if result.success else 'FAILED'}")
-    print(f"{'='*60}\n")
-
-    if result.error:
-        print(f"Error: {result.error}\n")
-        return 1
-
-    print(result.content)
+    # The content can be large, so it gets its own write
+    sys.stdout.write(summary)
+    sys.stdout.write(f"{result.content}\n")
+    sys.stdout.flush()
     return 0
 
 
@@ -214,42 +217,24 @@ async def run_pipeline(args: argparse.Namespace) -> int:
     4. Human reviews and approves Test Agent's work
     """
     # Use FullCICDPipeline if deploying, otherwise use DevTestPipeline
-    if hasattr(args, 'deploy') and args.deploy:
+    if args.deploy:
+        from pipeline import FullCICDPipeline
         pipeline = FullCICDPipeline(store_path=args.store)
     else:
+        from pipeline import DevTestPipeline
         pipeline = DevTestPipeline(store_path=args.store)
 
-    print(f"\n{'='*60}")
-    print("Claude Enterprise SDK - PIPELINE MODE")
-    print(f"{'='*60}")
-    print(f"Task: {args.task}")
-    print(f"Type: {args.type}")
-    print(f"Working directory: {args.dir}")
-    print(f"Approvals: {'Required' if not args.auto_approve else 'Auto-approved'}")
-    print(f"{'='*60}\n")
-
-    print("Pipeline stages:")
-    print("  1. Dev Agent   - Implement the task")
-    print("  2. Dev Review  - Human approves code changes")
-    print("  3. Test Agent  - Generate tests")
-    print("  4. Test Review - Human approves tests")
-    if hasattr(args, 'deploy') and args.deploy:
-        print("  5. Cyber Agent - Security scan")
-        print("  6. Security Gate - BLOCK/WARN/APPROVE")
-        print("  7. Build      - Jenkins build (if configured)")
-        print("  8. Deploy     - Deploy to environments")
-    print()
-
-    # Build deploy_to list from args
-    deploy_to = None
-    if hasattr(args, 'deploy') and args.deploy:
-        if args.deploy == "all":
-            deploy_to = ["dev", "staging", "prod"]
-        else:
-            deploy_to = [args.deploy]
-
-    # Get jenkins job if specified
-    jenkins_job = getattr(args, 'jenkins_job', None)
+    approvals = "Required" if not args.auto_approve else "Auto-approved"
+    stages = _PIPELINE_STAGES + (_CICD_STAGES if args.deploy else "")
+    sys.stdout.write(
+        f"\n{_BAR}\nClaude Enterprise SDK - PIPELINE MODE\n{_BAR}\n"
+        f"Task: {args.task}\nType: {args.type}\n"
+        f"Working directory: {args.dir}\nApprovals: {approvals}\n{_BAR}\n\n"
+        f"{stages}\n"
+    )
+    sys.stdout.flush()
+
+    deploy_to = list(_DEPLOY_TARGETS[args.deploy]) if args.deploy else None
 
     if deploy_to:
         result = await pipeline.run(
@@ -258,7 +243,7 @@ async def run_pipeline(args: argparse.Namespace) -> int:
             working_dir=args.dir,
             require_approvals=not args.auto_approve,
             deploy_to=deploy_to,
-            jenkins_job=jenkins_job
+            jenkins_job=args.jenkins_job
         )
     else:
         result = await pipeline.run(
@@ -279,46 +264,45 @@ async def run_pipeline(args: argparse.Namespace) -> int:
 
 async def run_interactive(args: argparse.Namespace) -> int:
     """Run in interactive mode with @agent mention support."""
-    dev_agent = DevAgent(store_path=args.store)
-    test_agent = TestAgent(store_path=args.store)
-    cyber_agent = CyberAgent(store_path=args.store)
-    cicd_agent = CICDAgent(store_path=args.store)
-    pipeline = DevTestPipeline(store_path=args.store)
-
-    print(f"\n{'='*60}")
-    print("Claude Enterprise SDK - Interactive Mode")
-    print(f"{'='*60}")
-    print(f"Working directory: {args.dir}")
-    print()
-    print("Agents:  @dev (default)  @test  @cyber  @cicd")
-    print()
-    print("Commands:")
-    print("  @test <task>     - Run task with Test Agent")
-    print("  @cyber <task>    - Run task with Cyber Agent")
-    print("  @cicd <task>     - Run task with CI/CD Agent")
-    print("  @dev <task>      - Run task with Dev Agent")
-    print("  <task>           - Run task with Dev Agent (default)")
-    print("  pipeline <task>  - Run Dev -> Test pipeline with approvals")
-    print("  resume           - Continue the last session")
-    print("  exit/quit        - Stop")
-    print(f"{'='*60}\n")
+    # Agents (and the pipeline) are imported and built on first use, so a
+    # session that only talks to @dev never initializes the others
+    loaded_agents = {}
+    pipeline = None
+
+    def get_agent(name: str):
+        """Get the agent for an @mention, constructing it on first use."""
+        agent = loaded_agents.get(name)
+        if agent is None:
+            module_name, class_name = _AGENTS[name]
+            agent_class = getattr(importlib.import_module(module_name), class_name)
+            agent = loaded_agents[name] = agent_class(store_path=args.store)
+        return agent
+
+    sys.stdout.write(
+        f"\n{_BAR}\nClaude Enterprise SDK - Interactive Mode\n{_BAR}\n"
+        f"Working directory: {args.dir}\n{_INTERACTIVE_HELP}"
+    )
 
     while True:
         try:
-            user_input = input("\n> ").strip()
+            user_input = (await ainput("\n> ")).strip()
 
             if not user_input:
                 continue
 
-            if user_input.lower() in ("exit", "quit", "q"):
+            lowered = user_input.lower()
+            if lowered in _EXIT_CMDS:
                 print("Goodbye!")
                 break
 
             # Check for pipeline command
-            if user_input.lower().startswith("pipeline "):
+            if lowered.startswith("pipeline "):
                 task = user_input[9:].strip()
                 if task:
                     print("\nStarting pipeline...\n")
+                    if pipeline is None:
+                        from pipeline import DevTestPipeline
+                        pipeline = DevTestPipeline(store_path=args.store)
                     result = await pipeline.run(
                         task=task,
                         working_dir=args.dir,
@@ -331,9 +315,9 @@ async def run_interactive(args: argparse.Namespace) -> int:
                 continue
 
             # Check for resume
-            resume = user_input.lower() == "resume"
+            resume = lowered == "resume"
             if resume:
-                task = input("Continue with task: ").strip()
+                task = (await ainput("Continue with task: ")).strip()
                 if not task:
                     print("No task provided.")
                     continue
@@ -342,43 +326,44 @@ async def run_interactive(args: argparse.Namespace) -> int:
                 agent_name, task = parse_agent_mention(user_input)
 
             print(f"\n[{agent_name}] Working...\n")
+            agent = get_agent(agent_name)
 
             if agent_name == "test":
-                result = await test_agent.explore_and_test(
+                result = await agent.explore_and_test(
                     description=task,
                     working_dir=args.dir
                 )
             elif agent_name == "cyber":
-                result = await cyber_agent.full_scan(
+                result = await agent.full_scan(
                     description=task,
                     working_dir=args.dir
                 )
             elif agent_name == "cicd":
-                result = await cicd_agent.run(
+                result = await agent.run(
                     task=task,
                     working_dir=args.dir
                 )
             else:
-                result = await dev_agent.custom_task(
+                result = await agent.custom_task(
                     description=task,
                     working_dir=args.dir,
                     resume=resume
                 )
 
             if result.error:
-                print(f"\nError: {result.error}")
+                sys.stdout.write(f"\nError: {result.error}\n")
             else:
-                print(f"\n{result.content}")
+                sys.stdout.write(f"\n{result.content}\n")
                 # Show security decision for cyber agent
+                footer = ""
                 if agent_name == "cyber" and result.success:
-                    decision, blockers = cyber_agent.parse_decision(result)
-                    print(f"\nSecurity Decision: {decision}")
-                    if blockers:
-                        for blocker in blockers:
-                            print(f"  - {blocker}")
-                print(f"\n[Task ID: {result.task_id}]")
-
-        except KeyboardInterrupt:
+                    decision, blockers = agent.parse_decision(result)
+                    footer = f"\nSecurity Decision: {decision}\n" + "".join(f"  - {blocker}\n" for blocker in blockers)
+                sys.stdout.write(f"{footer}\n[Task ID: {result.task_id}]\n")
+            sys.stdout.flush()
+
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # Under asyncio.run, Ctrl-C arrives as a cancellation of this task
             print("\n\nInterrupted. Goodbye!")
             break
 
@@ -386,14 +371,12 @@ async def run_interactive(args: argparse.Namespace) -> int:
             print("\nGoodbye!")
             break
 
+    # Write the agents' queued task contexts before the process exits
+    await asyncio.gather(*(agent.aclose() for agent in loaded_agents.values()))
     return 0
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Claude Enterprise SDK - AI Development Agent with Multi-Agent Pipeline",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_EPILOG = """
 Examples:
   # Interactive mode (default - just run claude-enterprise-sdk)
   claude-enterprise-sdk
@@ -422,7 +405,90 @@ Examples:
 
   # Rollback
   claude-enterprise-sdk --task "@cicd Rollback to 1.0.141" --deploy prod --artifact-version 1.0.141
-        """
+"""
+
+# Defaults for the CI/CD and pipeline-only flags, used when the minimal
+# parser handled argv and the full option set was never built.
+_EXTENDED_DEFAULTS = {
+    "type": "feature",
+    "auto_approve": False,
+    "deploy": None,
+    "jenkins_job": None,
+    "artifact_version": None,
+    "rollback": False,
+}
+
+# Namespace for a bare invocation with no arguments (pure interactive mode).
+_NO_ARGS_DEFAULTS = {
+    "task": None,
+    "dir": ".",
+    "task_id": None,
+    "resume": False,
+    "pipeline": False,
+    "interactive": False,
+    "store": "./context_store",
+    **_EXTENDED_DEFAULTS,
+}
+
+
+async def _dispatch(args) -> int:
+    """Run the mode selected by the parsed arguments.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Exit code
+    """
+    if args.pipeline:
+        return await run_pipeline(args)
+
+    if args.task:
+        # One-shot mode: parse @agent mention from task
+        agent_name, task = parse_agent_mention(args.task)
+        return await _run_agent(args, agent_name, task)
+
+    # Default: interactive mode
+    return await run_interactive(args)
+
+
+def _run(coro) -> int:
+    """Run a coroutine to completion, on uvloop when it is installed.
+
+    Args:
+        coro: Coroutine returning an exit code
+
+    Returns:
+        Exit code
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+
+    uvloop.install()
+    return asyncio.run(coro)
+
+
+def _build_parser(extended: bool = False, with_epilog: bool = False) -> argparse.ArgumentParser:
+    """Build the CLI argument parser.
+
+    Args:
+        extended: Also register the CI/CD and pipeline-only options
+        with_epilog: Attach the examples epilog (only needed for --help)
+
+    Returns:
+        Configured ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        description="Claude Enterprise SDK - AI Development Agent with Multi-Agent Pipeline",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG if with_epilog else None,
+        allow_abbrev=extended,
     )
 
     parser.add_argument(
@@ -430,13 +496,6 @@ Examples:
         help="Task description (prefix with @test or @cyber to select agent)"
     )
 
-    parser.add_argument(
-        "--type",
-        choices=["feature", "bugfix", "refactor", "review", "explore", "custom"],
-        default="feature",
-        help="Type of task for dev agent (default: feature)"
-    )
-
     parser.add_argument(
         "--dir", "-d",
         default=".",
@@ -460,12 +519,6 @@ Examples:
         help="Run full Dev -> Test pipeline with approval gates"
     )
 
-    parser.add_argument(
-        "--auto-approve",
-        action="store_true",
-        help="Auto-approve all stages (skip human approval prompts)"
-    )
-
     parser.add_argument(
         "--interactive", "-i",
         action="store_true",
@@ -478,6 +531,23 @@ Examples:
         help="Path to context store (default: ./context_store)"
     )
 
+    if not extended:
+        parser.set_defaults(**_EXTENDED_DEFAULTS)
+        return parser
+
+    parser.add_argument(
+        "--type",
+        choices=["feature", "bugfix", "refactor", "review", "explore", "custom"],
+        default="feature",
+        help="Type of task for dev agent (default: feature)"
+    )
+
+    parser.add_argument(
+        "--auto-approve",
+        action="store_true",
+        help="Auto-approve all stages (skip human approval prompts)"
+    )
+
     # CI/CD arguments
     parser.add_argument(
         "--deploy",
@@ -501,37 +571,41 @@ Examples:
         help="Rollback to previous version (use with --deploy and --artifact-version)"
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    argv = sys.argv[1:]
+    if not argv:
+        # No flags: skip argparse and the working-directory check (".").
+        args = argparse.Namespace(**_NO_ARGS_DEFAULTS)
+        sys.exit(_run(_dispatch(args)))
+
+    show_help = "-h" in argv or "--help" in argv
+
+    # Common path: the minimal parser covers everything on the command line.
+    # Pipeline mode and anything the minimal parser does not recognise
+    # (CI/CD flags, --type, abbreviations, typos) are re-parsed by the full
+    # parser, which also owns --help.
+    extended = True
+    if not show_help:
+        parser = _build_parser()
+        args, extra = parser.parse_known_args(argv)
+        extended = bool(extra) or args.pipeline
+    if extended:
+        parser = _build_parser(extended=True, with_epilog=show_help)
+        args = parser.parse_args(argv)
 
     # Pipeline mode requires --task
     if args.pipeline and not args.task:
         parser.error("--task is required for pipeline mode")
 
-    # Ensure working directory exists
-    work_dir = Path(args.dir)
-    if not work_dir.exists():
+    # Ensure working directory exists (the default "." always does)
+    if args.dir != "." and not os.path.isdir(args.dir):
         print(f"Error: Working directory does not exist: {args.dir}")
         sys.exit(1)
 
-    # Run appropriate mode
-    if args.pipeline:
-        exit_code = asyncio.run(run_pipeline(args))
-    elif args.task:
-        # One-shot mode: parse @agent mention from task
-        agent_name, task = parse_agent_mention(args.task)
-        if agent_name == "test":
-            exit_code = asyncio.run(run_test_task(args, task))
-        elif agent_name == "cyber":
-            exit_code = asyncio.run(run_cyber_task(args, task))
-        elif agent_name == "cicd":
-            exit_code = asyncio.run(run_cicd_task(args, task))
-        else:
-            exit_code = asyncio.run(run_task(args))
-    else:
-        # Default: interactive mode
-        exit_code = asyncio.run(run_interactive(args))
-
-    sys.exit(exit_code)
+    sys.exit(_run(_dispatch(args)))
 
 
 if __name__ == "__main__":
@@ -1,12 +1,33 @@
 """Configuration for Claude Enterprise SDK."""
 
+import json
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to the stdlib decoder
+    orjson = None
 
-@dataclass
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _env_fraction(name: str, default: float) -> float:
+    """A fraction from the environment, clamped to [0, 1]; default if unset or malformed."""
+    try:
+        value = float(os.getenv(name, default))
+    except ValueError:
+        return default
+    if value != value:  # NaN
+        return default
+    return min(max(value, 0.0), 1.0)
+
+
+@dataclass(frozen=True, **({"slots": True} if sys.version_info >= (3, 10) else {}))
 class JenkinsConfig:
     """Jenkins connection configuration."""
     url: str = ""
@@ -18,6 +39,7 @@ class JenkinsConfig:
     poll_interval_seconds: int = 10
 
     @classmethod
+    @lru_cache(maxsize=None)
     def from_env(cls) -> "JenkinsConfig":
         """Load configuration from environment variables."""
         return cls(
@@ -31,7 +53,7 @@ class JenkinsConfig:
         )
 
 
-@dataclass
+@dataclass(frozen=True, **({"slots": True} if sys.version_info >= (3, 10) else {}))
 class ArtifactoryConfig:
     """Artifactory connection configuration."""
     url: str = ""
@@ -42,6 +64,7 @@ class ArtifactoryConfig:
     timeout_seconds: int = 120
 
     @classmethod
+    @lru_cache(maxsize=None)
     def from_env(cls) -> "ArtifactoryConfig":
         """Load configuration from environment variables."""
         return cls(
@@ -54,16 +77,23 @@ class ArtifactoryConfig:
         )
 
 
-@dataclass
+@dataclass(frozen=True, **({"slots": True} if sys.version_info >= (3, 10) else {}))
 class DeploymentConfig:
     """Deployment environment configuration."""
     dev_auto_deploy: bool = True
     staging_auto_deploy: bool = False
     prod_requires_dual_approval: bool = True
-    prod_approvers: list[str] = field(default_factory=list)
+    prod_approvers: tuple[str, ...] = ()
     rollback_window_hours: int = 24
+    max_parallel_deploys: int = 3
+
+    def __post_init__(self):
+        # Accept any iterable (e.g. a list from a JSON config file), stored
+        # as a tuple so the frozen instance stays hashable
+        object.__setattr__(self, "prod_approvers", tuple(self.prod_approvers))
 
     @classmethod
+    @lru_cache(maxsize=None)
     def from_env(cls) -> "DeploymentConfig":
         """Load configuration from environment variables."""
         approvers = os.getenv("PROD_APPROVERS", "")
@@ -71,14 +101,19 @@ class DeploymentConfig:
             dev_auto_deploy=os.getenv("DEV_AUTO_DEPLOY", "true").lower() == "true",
             staging_auto_deploy=os.getenv("STAGING_AUTO_DEPLOY", "false").lower() == "true",
             prod_requires_dual_approval=os.getenv("PROD_DUAL_APPROVAL", "true").lower() == "true",
-            prod_approvers=approvers.split(",") if approvers else [],
+            prod_approvers=tuple(approvers.split(",")) if approvers else (),
             rollback_window_hours=int(os.getenv("ROLLBACK_WINDOW_HOURS", "24")),
+            max_parallel_deploys=int(os.getenv("MAX_PARALLEL_DEPLOYS", "3")),
         )
 
 
-@dataclass
+@dataclass(frozen=True, **({"slots": True} if sys.version_info >= (3, 10) else {}))
 class Config:
-    """Application configuration."""
+    """Application configuration.
+
+    Frozen, like the section classes: from_env() hands the same memoized
+    instance to every caller, so a change made by one would leak into all.
+    """
 
     # Context store location
     store_path: str = "./context_store"
@@ -93,12 +128,17 @@ class Config:
     audit_enabled: bool = True
     log_level: str = "INFO"
 
+    # Tool-use audit entries: on/off, and the fraction of calls logged
+    audit_tool_use: bool = True
+    audit_tool_use_sample: float = 1.0
+
     # CI/CD configurations
     jenkins: Optional[JenkinsConfig] = None
     artifactory: Optional[ArtifactoryConfig] = None
     deployment: Optional[DeploymentConfig] = None
 
     @classmethod
+    @lru_cache(maxsize=None)
     def from_env(cls) -> "Config":
         """Load configuration from environment variables."""
         return cls(
@@ -107,6 +147,8 @@ class Config:
             default_agent=os.getenv("CLAUDE_SDK_DEFAULT_AGENT", "dev"),
             audit_enabled=os.getenv("CLAUDE_SDK_AUDIT_ENABLED", "true").lower() == "true",
             log_level=os.getenv("CLAUDE_SDK_LOG_LEVEL", "INFO"),
+            audit_tool_use=os.getenv("AUDIT_TOOL_USE", "true").lower() == "true",
+            audit_tool_use_sample=_env_fraction("AUDIT_TOOL_USE_SAMPLE", 1.0),
             jenkins=JenkinsConfig.from_env(),
             artifactory=ArtifactoryConfig.from_env(),
             deployment=DeploymentConfig.from_env(),
@@ -115,16 +157,47 @@ class Config:
     @classmethod
     def from_file(cls, path: str) -> "Config":
         """Load configuration from a JSON file."""
-        import json
+        try:
+            data = _loads(Path(path).read_bytes())
+        except FileNotFoundError:
+            return cls()
+
+        # Sections the file leaves out or sets to null stay None, as in Config()
+        for name, section in _SECTIONS.items():
+            if isinstance(data.get(name), dict):
+                data[name] = section(**data[name])
+        return cls(**data)
+
+
+# CI/CD sections of Config, by attribute name
+_SECTIONS = {
+    "jenkins": JenkinsConfig,
+    "artifactory": ArtifactoryConfig,
+    "deployment": DeploymentConfig,
+}
+
+
+def get_config() -> Config:
+    """Return the global configuration, loading it from the environment on first use.
+
+    Every ``from_env()`` is memoized, so later environment changes are not
+    seen until ``clear_config_cache()`` is called.
+    """
+    return Config.from_env()
+
 
-        config_path = Path(path)
-        if config_path.exists():
-            with open(config_path) as f:
-                data = json.load(f)
-                return cls(**data)
+def clear_config_cache() -> None:
+    """Forget the memoized from_env() of Config and every CI/CD section.
 
-        return cls()
+    The next get_config() or section from_env() reads the environment again.
+    """
+    Config.from_env.cache_clear()
+    for section in _SECTIONS.values():
+        section.from_env.cache_clear()
 
 
-# Global config instance
-config = Config.from_env()
+def __getattr__(name: str):
+    # Backwards compatibility for the former module-level ``config`` instance
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,29 +7,7 @@ from typing import Optional, Any
 from datetime import datetime
 from pathlib import Path
 
-
-@dataclass
-class ArtifactoryConfig:
-    """Artifactory connection configuration."""
-    url: str = ""
-    username: str = ""
-    api_key: str = ""
-    default_repository: str = "libs-release-local"
-    verify_ssl: bool = True
-    timeout_seconds: int = 120
-
-    @classmethod
-    def from_env(cls) -> "ArtifactoryConfig":
-        """Load configuration from environment variables."""
-        import os
-        return cls(
-            url=os.getenv("ARTIFACTORY_URL", ""),
-            username=os.getenv("ARTIFACTORY_USERNAME", ""),
-            api_key=os.getenv("ARTIFACTORY_API_KEY", ""),
-            default_repository=os.getenv("ARTIFACTORY_REPOSITORY", "libs-release-local"),
-            verify_ssl=os.getenv("ARTIFACTORY_VERIFY_SSL", "true").lower() == "true",
-            timeout_seconds=int(os.getenv("ARTIFACTORY_TIMEOUT", "120")),
-        )
+from config import ArtifactoryConfig
 
 
 @dataclass
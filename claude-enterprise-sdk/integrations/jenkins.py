@@ -7,6 +7,8 @@ from typing import Optional, Any
 from datetime import datetime
 from enum import Enum
 
+from config import JenkinsConfig
+
 
 class BuildStatus(Enum):
     """Jenkins build status."""
@@ -18,30 +20,6 @@ class BuildStatus(Enum):
     RUNNING = "RUNNING"
 
 
-@dataclass
-class JenkinsConfig:
-    """Jenkins connection configuration."""
-    url: str = ""
-    username: str = ""
-    api_token: str = ""
-    verify_ssl: bool = True
-    timeout_seconds: int = 600
-    poll_interval_seconds: int = 10
-
-    @classmethod
-    def from_env(cls) -> "JenkinsConfig":
-        """Load configuration from environment variables."""
-        import os
-        return cls(
-            url=os.getenv("JENKINS_URL", ""),
-            username=os.getenv("JENKINS_USERNAME", ""),
-            api_token=os.getenv("JENKINS_API_TOKEN", ""),
-            verify_ssl=os.getenv("JENKINS_VERIFY_SSL", "true").lower() == "true",
-            timeout_seconds=int(os.getenv("JENKINS_TIMEOUT", "600")),
-            poll_interval_seconds=int(os.getenv("JENKINS_POLL_INTERVAL", "10")),
-        )
-
-
 @dataclass
 class JenkinsBuildInfo:
     """Information about a Jenkins build."""
@@ -189,7 +167,8 @@ class JenkinsClient:
     async def get_build_info(
         self,
         job_name: str,
-        build_number: int
+        build_number: int,
+        fields: Optional[tuple[str, ...]] = None
     ) -> JenkinsBuildInfo:
         """
         Get information about a specific build.
@@ -197,6 +176,9 @@ class JenkinsClient:
         Args:
             job_name: Name of the Jenkins job
             build_number: Build number
+            fields: Build fields to fetch via Jenkins' tree= projection
+                (e.g. "number", "artifacts[fileName]"); fetches the full
+                build object if not provided
 
         Returns:
             JenkinsBuildInfo with build details
@@ -204,6 +186,9 @@ class JenkinsClient:
         session = await self._get_session()
         base_url = self.config.url.rstrip("/")
         url = f"{base_url}/job/{job_name}/{build_number}/api/json"
+        if fields:
+            # "building" is always needed to tell a running build from a finished one
+            url += "?tree=" + ",".join(("building", *fields))
 
         async with session.get(url) as response:
             if response.status != 200:
@@ -234,7 +219,8 @@ class JenkinsClient:
         self,
         job_name: str,
         build_number: int,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        fields: Optional[tuple[str, ...]] = None
     ) -> JenkinsBuildInfo:
         """
         Wait for a build to complete.
@@ -243,6 +229,7 @@ class JenkinsClient:
             job_name: Name of the Jenkins job
             build_number: Build number
             timeout: Max wait time in seconds
+            fields: Build fields to fetch on each poll (see get_build_info)
 
         Returns:
             JenkinsBuildInfo with final build status
@@ -254,7 +241,7 @@ class JenkinsClient:
         start_time = asyncio.get_event_loop().time()
 
         while True:
-            info = await self.get_build_info(job_name, build_number)
+            info = await self.get_build_info(job_name, build_number, fields)
 
             if info.status not in (BuildStatus.RUNNING, BuildStatus.PENDING):
                 return info
@@ -333,7 +320,8 @@ class JenkinsClient:
         self,
         job_name: str,
         parameters: Optional[dict] = None,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        fields: Optional[tuple[str, ...]] = None
     ) -> JenkinsBuildInfo:
         """
         Trigger a build and wait for it to complete.
@@ -344,10 +332,11 @@ class JenkinsClient:
             job_name: Name of the Jenkins job
             parameters: Optional build parameters
             timeout: Max wait time in seconds
+            fields: Build fields to fetch while polling (see get_build_info)
 
         Returns:
             JenkinsBuildInfo with final build status
         """
         queue_id = await self.trigger_build(job_name, parameters)
         build_number = await self.wait_for_build_start(queue_id, timeout)
-        return await self.wait_for_build(job_name, build_number, timeout)
+        return await self.wait_for_build(job_name, build_number, timeout, fields)
@@ -1,6 +1,7 @@
 """Pipeline orchestration for multi-agent workflows with approval gates."""
 from __future__ import annotations
 
+import asyncio
 import uuid
 from dataclasses import dataclass, field
 from typing import Optional
@@ -38,6 +39,36 @@ class PipelineStage(Enum):
     FAILED = "failed"
 
 
+# Security decisions from least to most severe
+_DECISION_SEVERITY = ("APPROVE", "WARN", "BLOCK")
+
+
+def _combine_decisions(*decisions: tuple[str, list[str]]) -> tuple[str, list[str]]:
+    """Combine parsed scan decisions - the most severe one wins."""
+    decision = max((d for d, _ in decisions), key=_DECISION_SEVERITY.index)
+    blockers = []
+    for d, found in decisions:
+        if d == decision:
+            blockers.extend(b for b in found if b not in blockers)
+    return decision, blockers
+
+
+def _merge_scans(dev_scan: AgentResult, test_scan: AgentResult) -> AgentResult:
+    """Fold the dev and test scans into one result for reporting."""
+    return AgentResult(
+        task_id=dev_scan.task_id,
+        session_id=dev_scan.session_id,
+        content=(
+            f"## Dev changes\n\n{dev_scan.content}\n\n"
+            f"## Generated tests ({test_scan.task_id})\n\n{test_scan.content}"
+        ),
+        files_changed=dev_scan.files_changed + [
+            f for f in test_scan.files_changed if f not in dev_scan.files_changed
+        ],
+        decisions=dev_scan.decisions + test_scan.decisions,
+    )
+
+
 @dataclass
 class PipelineResult:
     """Result from a pipeline execution."""
@@ -85,7 +116,7 @@ class DevTestCyberPipeline:
         self.test_agent = TestAgent(store_path=store_path)
         self.cyber_agent = CyberAgent(store_path=store_path)
         self.approval_gate = ApprovalGate(store_path=store_path)
-        self.context_store = ContextStore(store_path=store_path)
+        self.context_store = ContextStore.shared(store_path)
 
     async def run(
         self,
@@ -108,6 +139,29 @@ class DevTestCyberPipeline:
         Returns:
             PipelineResult with outcomes from all stages
         """
+        try:
+            return await self._run_stages(task, task_type, working_dir, require_approvals, skip_design)
+        finally:
+            # Agents queue their task contexts; have them on disk before returning
+            await self.flush_saves()
+
+    async def flush_saves(self) -> None:
+        """Wait until every agent's queued task contexts have been written."""
+        await asyncio.gather(
+            self.dev_agent.flush_saves(),
+            self.test_agent.flush_saves(),
+            self.cyber_agent.flush_saves()
+        )
+
+    async def _run_stages(
+        self,
+        task: str,
+        task_type: str,
+        working_dir: str,
+        require_approvals: bool,
+        skip_design: bool
+    ) -> PipelineResult:
+        """Run the pipeline stages (see run())."""
         pipeline_id = f"pipeline-{uuid.uuid4().hex[:8]}"
 
         result = PipelineResult(
@@ -247,6 +301,21 @@ class DevTestCyberPipeline:
         # ============================================================
         result.stage = PipelineStage.DEV_APPROVAL
 
+        # With an explicit list of dev files the scan can start now, on that
+        # snapshot, and run during review and test generation; a rejection
+        # cancels it. Without one it would scan the working directory while
+        # the Test agent writes to it, so it waits until the tests exist.
+        dev_files = list(dev_result.files_changed)
+        cyber_scan = None
+        if dev_files:
+            cyber_scan = asyncio.ensure_future(self.cyber_agent.scan(
+                description=f"Security scan for: {task}",
+                working_dir=working_dir,
+                task_id=f"{pipeline_id}-cyber",
+                files_to_scan=dev_files,
+                context=f"Dev changes:\n{dev_result.content[:500]}"
+            ))
+
         if require_approvals:
             print("\n[STAGE 4/8] Dev Approval - Human Review Required")
             print("-" * 40)
@@ -266,10 +335,17 @@ class DevTestCyberPipeline:
                 result.approvals.append(approval.to_dict())
 
             except PermissionError as e:
+                if cyber_scan is not None:
+                    cyber_scan.cancel()
                 result.stage = PipelineStage.FAILED
                 result.success = False
                 result.error = f"Dev approval rejected: {str(e)}"
                 return result
+
+            except BaseException:
+                if cyber_scan is not None:
+                    cyber_scan.cancel()
+                raise
         else:
             print("\n[STAGE 4/8] Dev Approval - Skipped (auto-approve mode)")
 
@@ -278,6 +354,8 @@ class DevTestCyberPipeline:
         # ============================================================
         result.stage = PipelineStage.TEST
         print("\n[STAGE 5/8] Test Agent - Generating Tests...")
+        if cyber_scan is not None:
+            print("(Cyber Agent is scanning the dev changes in the background)")
         print("-" * 40)
 
         try:
@@ -288,23 +366,52 @@ class DevTestCyberPipeline:
                 dev_context=dev_result.content,
                 files_changed=dev_result.files_changed
             )
+        except BaseException as e:
+            if cyber_scan is not None:
+                cyber_scan.cancel()
+            if not isinstance(e, Exception):
+                raise
+            result.stage = PipelineStage.FAILED
+            result.success = False
+            result.error = f"Test Agent error: {str(e)}"
+            return result
 
-            result.test_result = test_result
-
-            if not test_result.success:
-                result.stage = PipelineStage.FAILED
-                result.success = False
-                result.error = f"Test Agent failed: {test_result.error}"
-                return result
-
-            print(f"\nTest Agent Output:\n{test_result.content[:500]}...")
+        result.test_result = test_result
 
-        except Exception as e:
+        if not test_result.success:
+            if cyber_scan is not None:
+                cyber_scan.cancel()
             result.stage = PipelineStage.FAILED
             result.success = False
-            result.error = f"Test Agent error: {str(e)}"
+            result.error = f"Test Agent failed: {test_result.error}"
             return result
 
+        print(f"\nTest Agent Output:\n{test_result.content[:500]}...")
+
+        # The remaining scan runs while the tests are under review: a single
+        # scan of the working directory if the dev scan has not started, else
+        # one of the generated test files when the Test agent listed them.
+        test_scan = None
+        if cyber_scan is None:
+            cyber_scan = asyncio.ensure_future(self.cyber_agent.scan(
+                description=f"Security scan for: {task}",
+                working_dir=working_dir,
+                task_id=f"{pipeline_id}-cyber",
+                context=(
+                    f"Dev changes:\n{dev_result.content[:500]}\n\n"
+                    f"Test changes:\n{test_result.content[:500]}"
+                )
+            ))
+        elif test_result.files_changed:
+            test_scan = asyncio.ensure_future(self.cyber_agent.scan(
+                description=f"Security scan of generated tests for: {task}",
+                working_dir=working_dir,
+                task_id=f"{pipeline_id}-cyber-tests",
+                files_to_scan=list(test_result.files_changed),
+                context=f"Test changes:\n{test_result.content[:500]}"
+            ))
+        scans = [cyber_scan] if test_scan is None else [cyber_scan, test_scan]
+
         # ============================================================
         # Stage 4: Test Approval
         # ============================================================
@@ -329,10 +436,17 @@ class DevTestCyberPipeline:
                 result.approvals.append(approval.to_dict())
 
             except PermissionError as e:
+                for scan in scans:
+                    scan.cancel()
                 result.stage = PipelineStage.FAILED
                 result.success = False
                 result.error = f"Test approval rejected: {str(e)}"
                 return result
+
+            except BaseException:
+                for scan in scans:
+                    scan.cancel()
+                raise
         else:
             print("\n[STAGE 6/8] Test Approval - Skipped (auto-approve mode)")
 
@@ -340,34 +454,37 @@ class DevTestCyberPipeline:
         # Stage 7: Cyber Agent - Security Scan
         # ============================================================
         result.stage = PipelineStage.CYBER
-        print("\n[STAGE 7/8] Cyber Agent - Security Scan...")
+        print("\n[STAGE 7/8] Cyber Agent - Security Scan Results")
         print("-" * 40)
 
-        try:
-            # Combine files from dev and test for scanning
-            all_files = list(set(
-                (dev_result.files_changed or []) +
-                (test_result.files_changed or [])
-            ))
+        scan_results = await asyncio.gather(*scans, return_exceptions=True)
+        for scan in scan_results:
+            if isinstance(scan, BaseException) and not isinstance(scan, Exception):
+                raise scan
 
-            cyber_result = await self.cyber_agent.scan(
-                description=f"Security scan for: {task}",
-                working_dir=working_dir,
-                task_id=f"{pipeline_id}-cyber",
-                files_to_scan=all_files if all_files else None,
-                context=f"Dev changes:\n{dev_result.content[:500]}\n\nTest changes:\n{test_result.content[:500]}"
-            )
-
-            result.cyber_result = cyber_result
+        for scan in scan_results:
+            if isinstance(scan, Exception):
+                result.stage = PipelineStage.FAILED
+                result.success = False
+                result.error = f"Cyber Agent error: {str(scan)}"
+                return result
 
-            if not cyber_result.success:
+            if not scan.success:
+                result.cyber_result = scan
                 result.stage = PipelineStage.FAILED
                 result.success = False
-                result.error = f"Cyber Agent failed: {cyber_result.error}"
+                result.error = f"Cyber Agent failed: {scan.error}"
                 return result
 
-            # Parse the security decision
-            decision, blockers = self.cyber_agent.parse_decision(cyber_result)
+        try:
+            # With two scans, the stricter decision applies
+            decision, blockers = _combine_decisions(
+                *(self.cyber_agent.parse_decision(scan) for scan in scan_results)
+            )
+            cyber_result = scan_results[0]
+            if len(scan_results) > 1:
+                cyber_result = _merge_scans(*scan_results)
+            result.cyber_result = cyber_result
             result.security_decision = decision
             result.security_blockers = blockers
 
@@ -531,14 +648,17 @@ class FullCICDPipeline(DevTestCyberPipeline):
 
         # Continue with CI/CD stages if deploy_to is specified
         if deploy_to:
-            result = await self._run_cicd_stages(
-                result=result,
-                working_dir=working_dir,
-                deploy_to=deploy_to,
-                require_approvals=require_approvals,
-                jenkins_job=jenkins_job,
-                artifact_path=artifact_path
-            )
+            try:
+                result = await self._run_cicd_stages(
+                    result=result,
+                    working_dir=working_dir,
+                    deploy_to=deploy_to,
+                    require_approvals=require_approvals,
+                    jenkins_job=jenkins_job,
+                    artifact_path=artifact_path
+                )
+            finally:
+                await self.cicd_agent.aclose()
 
         return result
 
@@ -567,6 +687,7 @@ class FullCICDPipeline(DevTestCyberPipeline):
         """
         from .agents.cicd_agent import Environment
         from .approval import require_dual_approval
+        from .config import DeploymentConfig
 
         pipeline_id = result.pipeline_id
 
@@ -655,13 +776,24 @@ class FullCICDPipeline(DevTestCyberPipeline):
         # ============================================================
         # Deployment Stages
         # ============================================================
-        for env_name in deploy_to:
-            env = Environment(env_name.lower())
+        # Staging and prod are promoted in order: each is approved and
+        # deployed before the next one starts. Dev deployments need no
+        # approval, so they run in the background alongside that. A failed
+        # deployment is recorded in deployment_results and does not stop
+        # the pipeline.
+        max_parallel = (
+            self.deployment_config.get("max_parallel_deploys")
+            or DeploymentConfig.from_env().max_parallel_deploys
+        )
+        semaphore = asyncio.Semaphore(max(1, max_parallel))
+        dev_deploys: list[tuple[str, asyncio.Future]] = []
 
-            if env == Environment.DEV:
-                # Dev: auto-deploy
-                result.stage = PipelineStage.DEPLOY_DEV
-                print(f"\n[STAGE] CI/CD Agent - Deploying to {env_name}...")
+        async def deploy_one(env: Environment, env_name: str, approved_by: list[str]) -> AgentResult:
+            async with semaphore:
+                if env == Environment.PROD:
+                    print(f"\n[STAGE] CI/CD Agent - Deploying to PRODUCTION...")
+                else:
+                    print(f"\n[STAGE] CI/CD Agent - Deploying to {env_name}...")
                 print("-" * 40)
 
                 deploy_result = await self.cicd_agent.deploy(
@@ -671,108 +803,105 @@ class FullCICDPipeline(DevTestCyberPipeline):
                     working_dir=working_dir,
                     task_id=f"{pipeline_id}-deploy-{env_name}",
                     pipeline_id=pipeline_id,
-                    approved_by=[]  # No approval needed for dev
+                    approved_by=approved_by
                 )
 
-                result.deployment_results[env_name] = deploy_result.success
-                if not deploy_result.success:
+                if env == Environment.DEV and not deploy_result.success:
                     print(f"\nWarning: {env_name} deployment failed: {deploy_result.error}")
+                return deploy_result
 
-            elif env == Environment.STAGING:
-                # Staging: single approval
-                result.stage = PipelineStage.DEPLOY_STAGING_APPROVAL
-
-                if require_approvals:
-                    print(f"\n[STAGE] Staging Deployment Approval Required")
-                    print("-" * 40)
-
-                    try:
-                        approval = await require_approval(
-                            self.approval_gate,
-                            agent="cicd",
-                            action="deployment_staging",
-                            description=f"Deploy {result.artifact_version} to staging",
-                            details={
-                                "artifact_version": result.artifact_version,
-                                "artifact_sha256": result.artifact_sha256,
-                                "pipeline_id": pipeline_id
-                            }
-                        )
-                        result.approvals.append(approval.to_dict())
-                        approver = approval.approver or "user"
-
-                    except PermissionError as e:
-                        result.stage = PipelineStage.FAILED
-                        result.success = False
-                        result.error = f"Staging deployment rejected: {str(e)}"
-                        return result
-                else:
-                    approver = "auto-approved"
+        async def promote() -> Optional[str]:
+            """Approve and deploy each environment; returns a rejection error, if any."""
+            for env_name in deploy_to:
+                env = Environment(env_name.lower())
 
-                result.stage = PipelineStage.DEPLOY_STAGING
-                print(f"\n[STAGE] CI/CD Agent - Deploying to staging...")
-                print("-" * 40)
+                if env == Environment.DEV:
+                    # Dev: auto-deploy
+                    result.stage = PipelineStage.DEPLOY_DEV
+                    dev_deploys.append((env_name, asyncio.ensure_future(
+                        deploy_one(env, env_name, [])  # No approval needed for dev
+                    )))
 
-                deploy_result = await self.cicd_agent.deploy(
-                    environment=env,
-                    artifact_version=result.artifact_version or "latest",
-                    artifact_sha256=result.artifact_sha256 or "",
-                    working_dir=working_dir,
-                    task_id=f"{pipeline_id}-deploy-staging",
-                    pipeline_id=pipeline_id,
-                    approved_by=[approver]
-                )
+                elif env == Environment.STAGING:
+                    # Staging: single approval
+                    result.stage = PipelineStage.DEPLOY_STAGING_APPROVAL
 
-                result.deployment_results["staging"] = deploy_result.success
-
-            elif env == Environment.PROD:
-                # Production: dual approval
-                result.stage = PipelineStage.DEPLOY_PROD_APPROVAL
-
-                if require_approvals:
-                    print(f"\n[STAGE] Production Deployment - DUAL APPROVAL Required")
-                    print("-" * 40)
-
-                    try:
-                        approval1, approval2 = await require_dual_approval(
-                            self.approval_gate,
-                            agent="cicd",
-                            action="deployment_prod",
-                            description=f"Deploy {result.artifact_version} to PRODUCTION",
-                            details={
-                                "artifact_version": result.artifact_version,
-                                "artifact_sha256": result.artifact_sha256,
-                                "pipeline_id": pipeline_id,
-                                "environment": "PRODUCTION"
-                            }
-                        )
-                        result.approvals.append(approval1.to_dict())
-                        result.approvals.append(approval2.to_dict())
-                        approvers = [approval1.approver or "user1", approval2.approver or "user2"]
-
-                    except PermissionError as e:
-                        result.stage = PipelineStage.FAILED
-                        result.success = False
-                        result.error = f"Production deployment rejected: {str(e)}"
-                        return result
-                else:
-                    approvers = ["auto-approved-1", "auto-approved-2"]
+                    if require_approvals:
+                        print(f"\n[STAGE] Staging Deployment Approval Required")
+                        print("-" * 40)
 
-                result.stage = PipelineStage.DEPLOY_PROD
-                print(f"\n[STAGE] CI/CD Agent - Deploying to PRODUCTION...")
-                print("-" * 40)
+                        try:
+                            approval = await require_approval(
+                                self.approval_gate,
+                                agent="cicd",
+                                action="deployment_staging",
+                                description=f"Deploy {result.artifact_version} to staging",
+                                details={
+                                    "artifact_version": result.artifact_version,
+                                    "artifact_sha256": result.artifact_sha256,
+                                    "pipeline_id": pipeline_id
+                                }
+                            )
+                            result.approvals.append(approval.to_dict())
+                            approver = approval.approver or "user"
+
+                        except PermissionError as e:
+                            return f"Staging deployment rejected: {str(e)}"
+                    else:
+                        approver = "auto-approved"
+
+                    result.stage = PipelineStage.DEPLOY_STAGING
+                    deploy_result = await deploy_one(env, "staging", [approver])
+                    result.deployment_results["staging"] = deploy_result.success
+
+                elif env == Environment.PROD:
+                    # Production: dual approval
+                    result.stage = PipelineStage.DEPLOY_PROD_APPROVAL
+
+                    if require_approvals:
+                        print(f"\n[STAGE] Production Deployment - DUAL APPROVAL Required")
+                        print("-" * 40)
 
-                deploy_result = await self.cicd_agent.deploy(
-                    environment=env,
-                    artifact_version=result.artifact_version or "latest",
-                    artifact_sha256=result.artifact_sha256 or "",
-                    working_dir=working_dir,
-                    task_id=f"{pipeline_id}-deploy-prod",
-                    pipeline_id=pipeline_id,
-                    approved_by=approvers
-                )
+                        try:
+                            approval1, approval2 = await require_dual_approval(
+                                self.approval_gate,
+                                agent="cicd",
+                                action="deployment_prod",
+                                description=f"Deploy {result.artifact_version} to PRODUCTION",
+                                details={
+                                    "artifact_version": result.artifact_version,
+                                    "artifact_sha256": result.artifact_sha256,
+                                    "pipeline_id": pipeline_id,
+                                    "environment": "PRODUCTION"
+                                }
+                            )
+                            result.approvals.append(approval1.to_dict())
+                            result.approvals.append(approval2.to_dict())
+                            approvers = [approval1.approver or "user1", approval2.approver or "user2"]
+
+                        except PermissionError as e:
+                            return f"Production deployment rejected: {str(e)}"
+                    else:
+                        approvers = ["auto-approved-1", "auto-approved-2"]
+
+                    result.stage = PipelineStage.DEPLOY_PROD
+                    deploy_result = await deploy_one(env, "prod", approvers)
+                    result.deployment_results["prod"] = deploy_result.success
+
+            return None
 
-                result.deployment_results["prod"] = deploy_result.success
+        try:
+            error = await promote()
+        finally:
+            # Background dev deployments are always seen through
+            for env_name, deploy in dev_deploys:
+                result.deployment_results[env_name] = (await deploy).success
+
+        if error:
+            result.stage = PipelineStage.FAILED
+            result.success = False
+            result.error = error
+            return result
 
         # ============================================================
         # Complete
@@ -1,5 +1,9 @@
 """Task templates for common development workflows."""
 
+from operator import itemgetter
+from string import Formatter
+from typing import Callable
+
 # =============================================================================
 # DESIGN TEMPLATE - For design-first workflow
 # =============================================================================
@@ -211,6 +215,43 @@ Provide:
 """
 
 
+def compile_template(template: str) -> Callable[..., str]:
+    """
+    Pre-parse a ``str.format`` template into its literal text and field names.
+
+    The returned function takes the fields as keyword arguments and fills
+    the template by interleaving the literals with the values, so the
+    template is parsed once instead of on every call. Templates with format
+    specs, conversions or non-identifier fields fall back to ``str.format``.
+    """
+    statics = [""]
+    names = []
+    for literal, name, spec, conversion in Formatter().parse(template):
+        statics[-1] += literal  # Escaped braces split a literal in several parts
+        if name is not None:
+            if spec or conversion or not name.isidentifier():
+                return template.format
+            names.append(name)
+            statics.append("")
+
+    if not names:
+        return lambda **values: statics[0]
+    if len(names) == 1:
+        name = names[0]
+        get_values = lambda values: (values[name],)
+    else:
+        get_values = itemgetter(*names)
+    size = len(statics) + len(names)
+
+    def render(**values: str) -> str:
+        parts = [None] * size
+        parts[::2] = statics
+        parts[1::2] = map(str, get_values(values))
+        return "".join(parts)
+
+    return render
+
+
 def get_template(task_type: str) -> str:
     """Get the appropriate template for a task type."""
     templates = {
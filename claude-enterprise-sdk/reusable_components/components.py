@@ -12,6 +12,7 @@ In production, this would connect to:
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 from pathlib import Path
 import json
@@ -389,6 +390,8 @@ class ComponentLibrary:
     def __init__(self, components: list[Component] = None):
         self.components = components or MOCK_COMPONENTS
         self._index = self._build_index()
+        # Prompt context by (search terms, limit) - repeated descriptions are common
+        self._cached_context = lru_cache(maxsize=128)(self._format_matches)
 
     def _build_index(self) -> dict[str, list[Component]]:
         """Build a tag-based index for fast searching."""
@@ -474,6 +477,28 @@ class ComponentLibrary:
 
         return "\n".join(lines)
 
+    def context_for(self, query: str, limit: int = 5) -> str:
+        """
+        Format the top components matching a query for an agent prompt.
+
+        Equivalent to ``format_for_prompt(search(query)[:limit])``, memoized
+        per set of search terms.
+
+        Args:
+            query: Search terms (space-separated)
+            limit: Maximum number of components to include
+
+        Returns:
+            Prompt section describing the matching components
+        """
+        return self._cached_context(tuple(query.lower().split()), limit)
+
+    def _format_matches(self, terms: tuple[str, ...], limit: int) -> str:
+        """Search and format for context_for (uncached)."""
+        if not terms or not self.components:
+            return self.format_for_prompt([])
+        return self.format_for_prompt(self.search(" ".join(terms))[:limit])
+
     def to_json(self) -> str:
         """Export library as JSON."""
         return json.dumps([c.to_dict() for c in self.components], indent=2)
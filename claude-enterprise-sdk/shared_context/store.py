@@ -1,14 +1,68 @@
 """Shared context store for cross-agent and cross-session state management."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import os
+import struct
+import sys
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Any
+from typing import Iterator, Optional, Any
 from dataclasses import dataclass, asdict
 
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to the stdlib encoder
+    orjson = None
 
-@dataclass
+try:
+    import fcntl
+except ImportError:  # Not available on Windows - writers are not serialized
+    fcntl = None
+
+# Keep os.open() from translating newlines on Windows
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+# Sidecar index record (decisions.idx), one per decision log line:
+# task_id hash (u64), byte offset (u64), line length (u32)
+_DECISION_IDX = struct.Struct("<QQI")
+
+
+def _task_hash(task_id: Any) -> int:
+    """Stable 64-bit hash of a task ID for the decision index."""
+    data = task_id.encode() if isinstance(task_id, str) else _dumps(task_id)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+if orjson is not None:
+    _OPT_PRETTY = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+    def _dumps(value: Any) -> bytes:
+        """Serialize a value compactly, for one JSONL line."""
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    def _dumps_pretty(value: Any) -> bytes:
+        """Serialize a value indented, for a standalone JSON file."""
+        return orjson.dumps(value, option=_OPT_PRETTY)
+
+    _loads = orjson.loads
+else:
+    def _dumps(value: Any) -> bytes:
+        """Serialize a value compactly, for one JSONL line."""
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    def _dumps_pretty(value: Any) -> bytes:
+        """Serialize a value indented, for a standalone JSON file."""
+        return json.dumps(value, indent=2).encode()
+
+    _loads = json.loads
+
+
+@dataclass(**({"slots": True} if sys.version_info >= (3, 10) else {}))
 class TaskContext:
     """Context for a specific task, shared between agents."""
     task_id: str
@@ -29,6 +83,158 @@ class TaskContext:
         return cls(**data)
 
 
+# A journal is compacted into a snapshot once it holds this many times more
+# lines than live keys (and at least _COMPACT_MIN_LINES lines)
+_COMPACT_RATIO = 4
+_COMPACT_MIN_LINES = 256
+
+
+# Parsed task contexts kept in memory per store
+_TASK_CACHE_SIZE = 256
+
+
+def _journal_lines(entries: dict) -> bytes:
+    """Serialize entries as journal lines."""
+    return b"".join(
+        _dumps([key, value]) + b"\n"
+        for key, value in entries.items()
+    )
+
+
+class _Journal:
+    """
+    A dict persisted as an append-only JSONL journal of ``[key, value]`` lines.
+
+    The journal is replayed into memory on first use; each update then
+    appends one line instead of rewriting the whole file. Lines appended by
+    other processes are picked up on the next access, and a journal that
+    outgrows its live keys is rewritten as a snapshot. Callers hold the
+    store lock around every method; appends and rewrites also hold a
+    cross-process lock on ``<name>.lock``, so a snapshot never drops lines
+    another process appended meanwhile.
+    """
+
+    def __init__(self, path: Path, legacy_path: Path):
+        self.path = path
+        self.legacy_path = legacy_path
+        self._lock_file = path.with_suffix(".lock")
+        self._lock_depth = 0
+        self._data: Optional[dict] = None
+        self._fp = None
+        self._ino: Optional[int] = None
+        self._size = 0
+        self._lines = 0
+
+    def get(self) -> dict:
+        """The current contents (do not mutate)."""
+        self._refresh()
+        return self._data
+
+    def update(self, entries: dict) -> None:
+        """Set several keys, appending one journal line per key."""
+        with self._locked():
+            # Under the lock, so a journal compacted elsewhere is reopened
+            # before appending rather than written to after its replacement
+            self._refresh()
+            data = _journal_lines(entries)
+            self._fp.write(data)
+            self._data.update(entries)
+            self._size += len(data)
+            self._lines += len(entries)
+
+            if self._lines >= _COMPACT_MIN_LINES and self._lines > _COMPACT_RATIO * len(self._data):
+                self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the journal as one line per live key."""
+        with self._locked():
+            self._refresh()
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_bytes(_journal_lines(self._data))
+            os.replace(tmp, self.path)
+            self._open()
+            self._lines = len(self._data)
+
+    def close(self) -> None:
+        """Close the journal and forget its contents."""
+        if self._fp is not None:
+            self._fp.close()
+        self._fp = None
+        self._data = None
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the cross-process lock on the journal (reentrant)."""
+        fd = None
+        if fcntl is not None and not self._lock_depth:
+            fd = os.open(self._lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+
+        self._lock_depth += 1
+        try:
+            if fd is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            self._lock_depth -= 1
+            if fd is not None:
+                # Closing the descriptor releases the lock
+                os.close(fd)
+
+    def _open(self) -> None:
+        if self._fp is not None:
+            self._fp.close()
+        self._fp = open(self.path, "ab", buffering=0)
+        st = os.fstat(self._fp.fileno())
+        self._ino, self._size = st.st_ino, st.st_size
+
+    def _refresh(self) -> None:
+        """Load the journal, or replay lines appended since it was last read."""
+        if self._data is not None:
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                st = None
+            if st is not None and st.st_ino == self._ino:
+                if st.st_size > self._size:
+                    self._replay(self._size)
+                return
+            # Replaced (compacted elsewhere) or removed - start over
+            self.close()
+
+        self._data = {}
+        self._lines = 0
+        if not self.path.exists() and self.legacy_path.exists():
+            with self._locked():
+                if not self.path.exists():
+                    # Seed the journal from a store written by the old whole-file format
+                    self.path.write_bytes(_journal_lines(_loads(self.legacy_path.read_bytes())))
+        self._open()
+        self._size = 0
+        self._replay(0)
+
+    def _replay(self, offset: int) -> None:
+        """Apply complete journal lines from offset onwards."""
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+        # A trailing partial line is still being written - leave it for later
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            try:
+                key, value = _loads(line)
+            except (ValueError, TypeError):
+                continue
+            self._data[key] = value
+            self._lines += 1
+        self._size = offset + end
+
+
+# Stores returned by ContextStore.shared(), by class and resolved path. Never
+# evicted: a second instance for a path would have its own journals and locks.
+_SHARED: dict[tuple[type, Path], "ContextStore"] = {}
+_SHARED_LOCK = threading.Lock()
+
+
 class ContextStore:
     """
     Persistent storage for agent context.
@@ -42,85 +248,145 @@ class ContextStore:
     def __init__(self, store_path: str = "./context_store"):
         self.store_path = Path(store_path)
         self.store_path.mkdir(parents=True, exist_ok=True)
+        # Serializes access to the journals across threads
+        self._lock = threading.Lock()
+
+        # Recently read or saved task contexts by task ID, each with the
+        # (mtime_ns, size) of the file it matches; oldest first
+        self._task_cache: dict[str, tuple[tuple[int, int], TaskContext]] = {}
+
+        # Append-only descriptors for decisions.jsonl and its decisions.idx
+        # sidecar, opened on first use
+        self._decision_fd: Optional[int] = None
+        self._decision_idx_fd: Optional[int] = None
+
+        # Indexes kept as append-only journals (see _Journal)
+        self._task_index = self._journal("task_index")
+        self._sessions = self._journal("sessions")
+        self._shared = self._journal("shared")
+
+    @classmethod
+    def shared(cls, store_path: str = "./context_store") -> "ContextStore":
+        """
+        Get the store for a path, shared by every caller using that path.
+
+        Agents and pipelines on the same store reuse one instance, so its
+        directory is set up once, its journals are loaded once, and index
+        updates from their worker threads do not overwrite each other.
+        Spellings of the same directory ("store", "./store") share it too.
+        """
+        key = (cls, Path(store_path).resolve())
+        with _SHARED_LOCK:
+            store = _SHARED.get(key)
+            if store is None:
+                store = _SHARED[key] = cls(store_path)
+        return store
+
+    def _journal(self, name: str) -> _Journal:
+        return _Journal(self.store_path / f"{name}.jsonl", self.store_path / f"{name}.json")
 
     # --- Task Context Management ---
 
     def save_task(self, context: TaskContext) -> None:
         """Save task context for cross-agent sharing."""
-        path = self.store_path / f"task_{context.task_id}.json"
-        path.write_text(json.dumps(context.to_dict(), indent=2))
+        self.save_tasks([context])
+
+    def save_tasks(self, contexts: list[TaskContext]) -> None:
+        """Save several task contexts, updating the task index once."""
+        for context in contexts:
+            path = self.store_path / f"task_{context.task_id}.json"
+            data = context.to_dict()
+            path.write_bytes(_dumps_pretty(data))
+            # Cache a copy, so later changes to the caller's object don't leak in
+            self._cache_task(path, TaskContext.from_dict(data))
 
         # Also update the task index
-        self._update_task_index(context.task_id, context.status)
+        self._update_task_index(contexts)
 
     def get_task(self, task_id: str) -> Optional[TaskContext]:
-        """Retrieve task context by ID."""
+        """
+        Retrieve task context by ID.
+
+        Contexts are cached and only re-read when their file changes, so
+        the returned object may be shared with other callers - don't mutate it.
+        """
         path = self.store_path / f"task_{task_id}.json"
-        if path.exists():
-            data = json.loads(path.read_text())
-            return TaskContext.from_dict(data)
-        return None
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        cached = self._task_cache.get(task_id)
+        if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+            return cached[1]
+
+        context = TaskContext.from_dict(_loads(path.read_bytes()))
+        self._cache_task(path, context)
+        return context
+
+    def _cache_task(self, path: Path, context: TaskContext) -> None:
+        """Remember a context as the current contents of its task file."""
+        st = os.stat(path)
+        with self._lock:
+            self._task_cache.pop(context.task_id, None)
+            self._task_cache[context.task_id] = ((st.st_mtime_ns, st.st_size), context)
+            if len(self._task_cache) > _TASK_CACHE_SIZE:
+                del self._task_cache[next(iter(self._task_cache))]
 
     def get_latest_task(self, agent: Optional[str] = None) -> Optional[TaskContext]:
         """Get the most recent task, optionally filtered by agent."""
         index = self._get_task_index()
 
-        for task_id in reversed(list(index.keys())):
+        for task_id, entry in reversed(index.items()):
+            # The index names each task's agent (entries written before it
+            # did have to be checked against the task file)
+            if agent is not None and entry.get("agent", agent) != agent:
+                continue
             task = self.get_task(task_id)
             if task and (agent is None or task.agent == agent):
                 return task
         return None
 
-    def _update_task_index(self, task_id: str, status: str) -> None:
+    def _update_task_index(self, contexts: list[TaskContext]) -> None:
         """Maintain an index of all tasks."""
-        index_path = self.store_path / "task_index.json"
-        index = self._get_task_index()
-        index[task_id] = {
-            "status": status,
-            "updated_at": datetime.now().isoformat()
+        updated_at = datetime.now().isoformat()
+        entries = {
+            context.task_id: {
+                "status": context.status,
+                "agent": context.agent,
+                "updated_at": updated_at
+            }
+            for context in contexts
         }
-        index_path.write_text(json.dumps(index, indent=2))
+        with self._lock:
+            self._task_index.update(entries)
 
     def _get_task_index(self) -> dict:
         """Load the task index."""
-        index_path = self.store_path / "task_index.json"
-        if index_path.exists():
-            return json.loads(index_path.read_text())
-        return {}
+        with self._lock:
+            return dict(self._task_index.get())
 
     # --- Session Management ---
 
     def save_session(self, agent: str, session_id: str, task_id: Optional[str] = None) -> None:
         """Save session ID for resumption."""
-        sessions_path = self.store_path / "sessions.json"
-        sessions = self._get_sessions()
-
-        sessions[agent] = {
+        entry = {
             "session_id": session_id,
             "task_id": task_id,
             "timestamp": datetime.now().isoformat()
         }
-
-        sessions_path.write_text(json.dumps(sessions, indent=2))
+        with self._lock:
+            self._sessions.update({agent: entry})
 
     def get_session(self, agent: str) -> Optional[dict]:
         """Get session info for an agent."""
-        sessions = self._get_sessions()
-        return sessions.get(agent)
-
-    def _get_sessions(self) -> dict:
-        """Load all sessions."""
-        sessions_path = self.store_path / "sessions.json"
-        if sessions_path.exists():
-            return json.loads(sessions_path.read_text())
-        return {}
+        with self._lock:
+            return self._sessions.get().get(agent)
 
     # --- Decision Log ---
 
     def log_decision(self, agent: str, task_id: str, decision: str, reasoning: str) -> None:
         """Log a decision for audit trail."""
-        log_path = self.store_path / "decisions.jsonl"
-
         entry = {
             "timestamp": datetime.now().isoformat(),
             "agent": agent,
@@ -129,8 +395,91 @@ class ContextStore:
             "reasoning": reasoning
         }
 
-        with open(log_path, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        line = _dumps(entry) + b"\n"
+
+        with self._lock:
+            fd = self._decision_log()
+            # Keep other processes' lines (and index records) from
+            # interleaving with ours
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                offset = os.fstat(fd).st_size
+                view = memoryview(line)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.write(self._decision_idx_fd, _DECISION_IDX.pack(_task_hash(task_id), offset, len(line)))
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _decision_log(self) -> int:
+        """The open decision log descriptor, (re)opened if needed (hold the lock)."""
+        fd = self._decision_fd
+        if fd is not None and os.fstat(fd).st_nlink > 0:
+            return fd
+
+        # First use, or the log was removed (e.g. cleared) since it was opened.
+        # Writes are unbuffered, so nothing is lost if it is never closed.
+        self._close_decision_log()
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | _O_BINARY
+        fd = self._decision_fd = os.open(self.store_path / "decisions.jsonl", flags, 0o644)
+        # A fresh log invalidates whatever index was left behind
+        if os.fstat(fd).st_size == 0:
+            flags |= os.O_TRUNC
+        self._decision_idx_fd = os.open(self.store_path / "decisions.idx", flags, 0o644)
+
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            self._backfill_decision_index()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        return fd
+
+    def _backfill_decision_index(self) -> None:
+        """
+        Index the decision log lines decisions.idx does not cover yet.
+
+        That is the whole log when it predates the index, or the tail left
+        behind when a process stopped between writing a line and its
+        record. An index that is not a clean prefix of the log is rebuilt.
+        """
+        size = os.fstat(self._decision_fd).st_size
+        data = (self.store_path / "decisions.idx").read_bytes()
+        usable = len(data) - len(data) % _DECISION_IDX.size
+
+        covered = end = 0
+        for _, offset, length in _DECISION_IDX.iter_unpack(data[:usable]):
+            covered += length
+            end = max(end, offset + length)
+        if covered == size and usable == len(data):
+            return
+        if covered != end or covered > size:
+            covered = usable = 0
+        os.ftruncate(self._decision_idx_fd, usable)
+
+        records = []
+        with open(self.store_path / "decisions.jsonl", "rb") as f:
+            f.seek(covered)
+            offset = covered
+            while offset < size:
+                line = f.readline(size - offset)
+                try:
+                    entry = _loads(line)
+                except ValueError:
+                    entry = None
+                task_id = entry.get("task_id") if isinstance(entry, dict) else None
+                records.append(_DECISION_IDX.pack(_task_hash(task_id), offset, len(line)))
+                offset += len(line)
+        os.write(self._decision_idx_fd, b"".join(records))
+
+    def _close_decision_log(self) -> None:
+        for fd in (self._decision_fd, self._decision_idx_fd):
+            if fd is not None:
+                os.close(fd)
+        self._decision_fd = self._decision_idx_fd = None
 
     def get_decisions(self, task_id: Optional[str] = None) -> list[dict]:
         """Retrieve decisions, optionally filtered by task."""
@@ -139,46 +488,162 @@ class ContextStore:
         if not log_path.exists():
             return []
 
+        # A task's decisions are read straight from the offsets in the index
+        if task_id is not None:
+            decisions = self._get_indexed_decisions(log_path, task_id)
+            if decisions is not None:
+                return decisions
+
         decisions = []
-        with open(log_path, "r") as f:
+        with open(log_path, "rb") as f:
             for line in f:
                 if line.strip():
-                    entry = json.loads(line)
+                    entry = _loads(line)
                     if task_id is None or entry.get("task_id") == task_id:
                         decisions.append(entry)
 
         return decisions
 
+    def _get_indexed_decisions(self, log_path: Path, task_id: str) -> Optional[list[dict]]:
+        """
+        Read one task's decisions via the decisions.idx sidecar.
+
+        Returns None when the index is missing or does not account for every
+        byte of the log (e.g. a log from before the index existed, until the
+        next log_decision() backfills it), in which case the caller scans
+        the log instead.
+        """
+        try:
+            data = log_path.with_suffix(".idx").read_bytes()
+        except FileNotFoundError:
+            return None
+
+        wanted = _task_hash(task_id)
+        covered = 0
+        matches = []
+        usable = len(data) - len(data) % _DECISION_IDX.size
+        for rec_task, offset, length in _DECISION_IDX.iter_unpack(data[:usable]):
+            covered += length
+            if rec_task == wanted:
+                matches.append((offset, length))
+
+        decisions = []
+        with open(log_path, "rb") as f:
+            if covered != os.fstat(f.fileno()).st_size:
+                return None
+            try:
+                for offset, length in matches:
+                    f.seek(offset)
+                    entry = _loads(f.read(length))
+                    # Re-check the real value - hashes can collide
+                    if entry.get("task_id") == task_id:
+                        decisions.append(entry)
+            except ValueError:
+                # Offsets that do not land on a JSON line - don't trust the index
+                return None
+
+        return decisions
+
     # --- Shared State ---
 
     def set_shared(self, key: str, value: Any) -> None:
         """Set a shared value accessible by all agents."""
-        shared_path = self.store_path / "shared.json"
-        shared = self._get_shared()
-        shared[key] = {
+        entry = {
             "value": value,
             "updated_at": datetime.now().isoformat()
         }
-        shared_path.write_text(json.dumps(shared, indent=2))
+        with self._lock:
+            self._shared.update({key: entry})
 
     def get_shared(self, key: str) -> Optional[Any]:
         """Get a shared value."""
-        shared = self._get_shared()
-        entry = shared.get(key)
+        with self._lock:
+            entry = self._shared.get().get(key)
         return entry.get("value") if entry else None
 
-    def _get_shared(self) -> dict:
-        """Load shared state."""
-        shared_path = self.store_path / "shared.json"
-        if shared_path.exists():
-            return json.loads(shared_path.read_text())
-        return {}
+    # --- Async API ---
+    #
+    # Coroutine counterparts of the methods above for callers on an event
+    # loop. Each runs the blocking file I/O in a worker thread.
+
+    async def asave_task(self, context: TaskContext) -> None:
+        """Async save_task."""
+        await asyncio.to_thread(self.save_task, context)
+
+    async def asave_tasks(self, contexts: list[TaskContext]) -> None:
+        """Async save_tasks."""
+        await asyncio.to_thread(self.save_tasks, contexts)
+
+    async def aget_task(self, task_id: str) -> Optional[TaskContext]:
+        """Async get_task."""
+        return await asyncio.to_thread(self.get_task, task_id)
+
+    async def aget_latest_task(self, agent: Optional[str] = None) -> Optional[TaskContext]:
+        """Async get_latest_task."""
+        return await asyncio.to_thread(self.get_latest_task, agent)
+
+    async def asave_session(self, agent: str, session_id: str, task_id: Optional[str] = None) -> None:
+        """Async save_session."""
+        await asyncio.to_thread(self.save_session, agent, session_id, task_id)
+
+    async def aget_session(self, agent: str) -> Optional[dict]:
+        """Async get_session."""
+        return await asyncio.to_thread(self.get_session, agent)
+
+    async def alog_decision(self, agent: str, task_id: str, decision: str, reasoning: str) -> None:
+        """Async log_decision."""
+        await asyncio.to_thread(self.log_decision, agent, task_id, decision, reasoning)
+
+    async def aget_decisions(self, task_id: Optional[str] = None) -> list[dict]:
+        """Async get_decisions."""
+        return await asyncio.to_thread(self.get_decisions, task_id)
+
+    async def aset_shared(self, key: str, value: Any) -> None:
+        """Async set_shared."""
+        await asyncio.to_thread(self.set_shared, key, value)
+
+    async def aget_shared(self, key: str) -> Optional[Any]:
+        """Async get_shared."""
+        return await asyncio.to_thread(self.get_shared, key)
+
+    async def aclear(self) -> None:
+        """Async clear."""
+        await asyncio.to_thread(self.clear)
 
     # --- Utilities ---
 
+    def compact(self) -> None:
+        """Rewrite the index journals as snapshots of their current contents."""
+        with self._lock:
+            for journal in (self._task_index, self._sessions, self._shared):
+                journal.compact()
+
+    def close(self) -> None:
+        """Close the decision log and index journals (reopened on next use)."""
+        with self._lock:
+            self._close_files()
+
+    def _close_files(self) -> None:
+        self._close_decision_log()
+        for journal in (self._task_index, self._sessions, self._shared):
+            journal.close()
+
     def clear(self) -> None:
-        """Clear all stored context (use with caution)."""
-        for path in self.store_path.glob("*.json"):
-            path.unlink()
-        for path in self.store_path.glob("*.jsonl"):
-            path.unlink()
+        """
+        Clear all stored context (use with caution).
+
+        Only the store's own files are removed; others sharing the directory
+        (audit log, approvals) are left alone.
+        """
+        with self._lock:
+            self._close_files()
+            self._task_cache.clear()
+            for path in self.store_path.glob("task_*.json"):
+                path.unlink()
+            for name in (
+                "task_index.jsonl", "task_index.json",
+                "sessions.jsonl", "sessions.json",
+                "shared.jsonl", "shared.json",
+                "decisions.jsonl", "decisions.idx",
+            ):
+                (self.store_path / name).unlink(missing_ok=True)